@@ -1,13 +1,25 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
-import plotly.express as px
-import pickle
 import joblib
 from streamlit_option_menu import option_menu
+from daegu_data import DATA_PATH, clean_listings, compact_listings, load_listings
+from dashboard_figures import capstone_figures
+from drift_monitor import DriftMonitor, load_reference
+from warmup import get_model
+from prediction_store import PredictionStore
 
-# Load pipeline:
-model_pipeline = pickle.load(open('xgb_daegu_apartments_pipeline.sav', 'rb'))
+# Model registry, loaded once per process (active model plus optional A/B challenger):
+model_pipeline = get_model()
+
+# Stored batch predictions, keyed by model version:
+prediction_store = PredictionStore()
+
+# Load training reference sketches for drift checks:
+drift_reference = load_reference()
+
+# Rows scored per chunk in batch predictions:
+BATCH_CHUNK_SIZE = 10000
 
 # Sidebar navigation for multipage:
 with st.sidebar:
@@ -95,12 +107,11 @@ def data_analysis():
     > Explore the hidden stories behind square footage, hallway types, subway stations, and more.
     """)
 
-    # Load data:
-    data = pd.read_csv('data_daegu_apartment.csv')
-    st.write("Quick Peek at the Dataset:", data.head())
+    # Quick peek at the raw file:
+    st.write("Quick Peek at the Dataset:", pd.read_csv(DATA_PATH, nrows=5))
 
-    # Ensure HallwayType values are clean:
-    data['HallwayType'] = data['HallwayType'].str.strip().str.title()
+    # Build every chart from the cleaned, compact data:
+    figures = capstone_figures(load_listings())
 
     # Bar Chart | Hallway Type:
     st.markdown(
@@ -120,33 +131,8 @@ def data_analysis():
         """,
         unsafe_allow_html=True
     )
-    avg_price_by_hallway = data.groupby('HallwayType', as_index=False)['SalePrice'].mean()
-    fig = px.bar(
-        avg_price_by_hallway, x='HallwayType', y='SalePrice',
-        labels={'SalePrice': 'Average Sale Price (₩)'},
-        color='HallwayType',
-        color_discrete_map={
-            'Terraced': '#FF8DA1',
-            'Mixed': '#F77896',
-            'Corridor': '#FFB6C1'
-        }
-    )
-    st.plotly_chart(fig, use_container_width=True)
-
-    # Manually map TimeToSubway values using your predefined mapping:
-    time_rename_map = {
-        '5min~10min': '5min-10min',
-        '10min~15min': '10min-15min',
-        '15min~20min': '15min-20min',
-        'no_bus_stop_nearby': 'No Bus Stop Nearby'
-    }
+    st.plotly_chart(figures['hallway'], use_container_width=True)
 
-    # Apply the mapping to the TimeToSubway column:
-    data['TimeToSubway'] = data['TimeToSubway'].replace(time_rename_map)
-
-    # Order the TimeToSubway values:
-    time_order = ['0-5min', '5min-10min', '10min-15min', '15min-20min', 'No Bus Stop Nearby']
-    
     # Box Plot | Time to Subway:
     st.markdown(
         """
@@ -165,30 +151,7 @@ def data_analysis():
         """,
         unsafe_allow_html=True
     )
-    fig = px.box(
-        data, x='TimeToSubway', y='SalePrice',
-        category_orders={'TimeToSubway': time_order}
-    )
-    fig.update_traces(marker_color='#FF8DA1')
-    st.plotly_chart(fig, use_container_width=True)
-
-    # Manually map SubwayStation values using your predefined mapping:
-    subway_rename_map = {
-        'Myung-duk': 'Myung-duk',
-        'Kyungbuk_uni_hospital': 'Kyungbuk Uni Hospital',
-        'Sin-nam': 'Sin-nam',
-        'Banwoldang': 'Banwoldang',
-        'Bangoge': 'Bangoge',
-        'no_subway_nearby': 'No Subway Nearby',
-        'Chil-sung-market': 'Chil-sung Market',
-        'Daegu': 'Daegu'
-    }
-
-    # Apply the mapping to the SubwayStation column:
-    data['SubwayStation'] = data['SubwayStation'].map(subway_rename_map)
-
-    # Custom pink colour palette:
-    custom_pinks = ['#FFC0CB', '#FFB6C1', '#FF69B4', '#FF1493', '#DB7093', '#C71585', '#E75480', '#F8BBD0']
+    st.plotly_chart(figures['time_to_subway'], use_container_width=True)
 
     # Bar Chart | Subway Station:
     st.markdown(
@@ -208,21 +171,7 @@ def data_analysis():
         """,
         unsafe_allow_html=True
     )
-    avg_price_by_station = data.groupby('SubwayStation', as_index=False)['SalePrice'].mean()
-    fig = px.bar(
-        avg_price_by_station, x='SubwayStation', y='SalePrice',
-        labels={'SalePrice': 'Average Sale Price (₩)'},
-        color='SubwayStation',
-        color_discrete_sequence=custom_pinks
-
-    )
-    st.plotly_chart(fig, use_container_width=True)
-
-    # Reusable Box Plot:
-    def box_plot(x_col, title):
-        fig = px.box(data, x=x_col, y='SalePrice', title=title)
-        fig.update_traces(marker_color='#FF8DA1')
-        st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(figures['subway_station'], use_container_width=True)
 
     st.markdown(
         """
@@ -241,9 +190,9 @@ def data_analysis():
         """,
         unsafe_allow_html=True
     )
-    box_plot('N_FacilitiesNearBy(ETC)', "Nearby Facilities vs Apartment Prices: More Shops, More Won?")
-    box_plot('N_FacilitiesNearBy(PublicOffice)', "Nearby Public Offices vs Apartment Prices: Do Public Offices Boost Prices?")
-    box_plot('N_SchoolNearBy(University)', "Nearby Universities vs Apartment Prices: Are Apartments Near Universities Worth More?")
+    st.plotly_chart(figures['facilities_etc'], use_container_width=True)
+    st.plotly_chart(figures['public_office'], use_container_width=True)
+    st.plotly_chart(figures['university'], use_container_width=True)
 
     st.markdown(
         """
@@ -262,31 +211,7 @@ def data_analysis():
         """,
         unsafe_allow_html=True
     )
-    box_plot('N_FacilitiesInApt', "Apartment Facilities vs Apartment Prices: Do More Facilities Mean Higher Prices?")
-
-    # Scatter Plot with Trendline and Outliers:
-    def scatter_outlier_plot(x_col, title):
-        Q1 = data['SalePrice'].quantile(0.25)
-        Q3 = data['SalePrice'].quantile(0.75)
-        IQR = Q3 - Q1
-        lower, upper = Q1 - 1.5 * IQR, Q3 + 1.5 * IQR
-        outliers = data[(data['SalePrice'] < lower) | (data['SalePrice'] > upper)]
-
-        fig = px.scatter(
-            data, x=x_col, y='SalePrice',
-            title=title,
-            hover_data=['HallwayType', 'TimeToSubway', 'SubwayStation', 'YearBuilt'],
-            trendline='ols',
-            trendline_color_override='red'
-        )
-        fig.update_traces(marker=dict(color='#FF8DA1', size=8))
-
-        fig.add_scatter(
-            x=outliers[x_col], y=outliers['SalePrice'], mode='markers',
-            marker=dict(color='#FF6F91', size=10, symbol='x'), name='Outliers'
-        )
-
-        st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(figures['facilities_in_apt'], use_container_width=True)
 
     st.markdown(
         """
@@ -305,9 +230,9 @@ def data_analysis():
         """,
         unsafe_allow_html=True
     )
-    scatter_outlier_plot('N_Parkinglot(Basement)', "Basement Parking Spaces vs Apartment Prices: Do More Basement Parking Spaces Drive Up Prices?")
-    scatter_outlier_plot('YearBuilt', "Year Built vs Apartment Prices: How Much Does Year Built Matter?")
-    scatter_outlier_plot('Size(sqf)', "Apartment Size vs Apartment Prices: Bigger Means Pricier? Let's See!")
+    st.plotly_chart(figures['parking'], use_container_width=True)
+    st.plotly_chart(figures['year_built'], use_container_width=True)
+    st.plotly_chart(figures['size'], use_container_width=True)
 
     # Parallel Coordinates:
     st.markdown(
@@ -327,22 +252,7 @@ def data_analysis():
         """,
         unsafe_allow_html=True
     )
-    fig = px.parallel_coordinates(
-    data,
-    dimensions=[
-        'Size(sqf)', 'YearBuilt', 'N_FacilitiesInApt',
-        'N_FacilitiesNearBy(ETC)', 'N_SchoolNearBy(University)'
-    ],
-    color='SalePrice',
-    color_continuous_scale=['#FFE5EC', '#FFB3D1', '#FF5CA8', '#C9184A', '#86002D'],
-)
-
-    fig.update_layout(
-        margin=dict(l=50, r=50, t=50, b=50),
-        width=900
-    )
-
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(figures['parallel'], use_container_width=True)
 
     # Faceted Plot:
     st.markdown(
@@ -362,26 +272,7 @@ def data_analysis():
         """,
         unsafe_allow_html=True
     )
-    custom_pink_scale = ["#CF3F59", '#F77896', "#5D1B25"]
-
-    # Order the TimeToSubway values:
-    time_order = ['0-5min', '5min-10min', '10min-15min', '15min-20min', 'No Bus Stop Nearby']
-
-    # Create the figure:
-    fig = px.scatter(
-        data,
-        x='Size(sqf)',
-        y='SalePrice',
-        color='HallwayType',
-        facet_col='TimeToSubway',
-        facet_col_wrap=3,
-        color_discrete_sequence=custom_pink_scale,
-        category_orders={'TimeToSubway': time_order},
-        title='Sale Price vs Size Faceted by Subway Time and Hallway Type'
-    )
-
-    # Display in Streamlit:
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(figures['faceted'], use_container_width=True)
 
 
 def price_predictor():
@@ -468,40 +359,49 @@ def price_predictor():
 
     if uploaded_file is not None:
         try:
-            user_data = pd.read_csv(uploaded_file)
-
-            # Apply renaming to match the training data:
-            if 'HallwayType' in user_data.columns:
-                user_data['HallwayType'] = user_data['HallwayType'].str.strip().str.title()
-
-            time_rename_map = {
-                '5min~10min': '5min-10min',
-                '10min~15min': '10min-15min',
-                '15min~20min': '15min-20min',
-                'no_bus_stop_nearby': 'No Bus Stop Nearby'
-            }
-            subway_rename_map = {
-                'Myung-duk': 'Myung-duk',
-                'Kyungbuk_uni_hospital': 'Kyungbuk Uni Hospital',
-                'Sin-nam': 'Sin-nam',
-                'Banwoldang': 'Banwoldang',
-                'Bangoge': 'Bangoge',
-                'no_subway_nearby': 'No Subway Nearby',
-                'Chil-sung-market': 'Chil-sung Market',
-                'Daegu': 'Daegu'
-            }
-
-            if 'TimeToSubway' in user_data.columns:
-                user_data['TimeToSubway'] = user_data['TimeToSubway'].replace(time_rename_map)
-            if 'SubwayStation' in user_data.columns:
-                user_data['SubwayStation'] = user_data['SubwayStation'].replace(subway_rename_map)
-
-            # Predict using the trained pipeline:
-            predictions_log = model_pipeline.predict(user_data)
-            predictions = np.expm1(predictions_log)
-
-            # Add predictions to DataFrame:
-            user_data['Predicted Sale Price (₩)'] = predictions
+            # Stream the upload in chunks, checking drift before scoring:
+            monitor = DriftMonitor(drift_reference)
+            routed_model = model_pipeline.route()
+            results = []
+            n_cached = n_duplicates = n_skipped = 0
+            raw_bytes = compact_bytes = 0
+            for chunk in pd.read_csv(uploaded_file, chunksize=BATCH_CHUNK_SIZE):
+                raw_bytes += chunk.memory_usage(deep=True).sum()
+                chunk = compact_listings(clean_listings(chunk))
+                compact_bytes += chunk.memory_usage(deep=True).sum()
+                drift_flags = monitor.update(chunk)
+
+                # Rows with missing values or unseen categories cannot be encoded, so they get no price:
+                scorable = drift_flags.pop('Scorable').to_numpy()
+                predictions_log = np.full(len(chunk), np.nan)
+                if scorable.any():
+                    # Predict new rows only, reusing earlier predictions:
+                    predictions_log[scorable], stats = prediction_store.predict(
+                        routed_model, chunk[scorable], routed_model.version
+                    )
+                    n_cached += stats['cached']
+                    n_duplicates += stats['duplicates']
+                n_skipped += int((~scorable).sum())
+                chunk['Predicted Sale Price (₩)'] = np.expm1(predictions_log)
+                results.append(chunk.join(drift_flags))
+            # Chunks with different categories concatenate to object columns, so compact again:
+            user_data = compact_listings(pd.concat(results))
+            if n_cached or n_duplicates:
+                st.caption(f"Reused {n_cached} stored predictions and skipped {n_duplicates} duplicate rows.")
+            st.caption(f"Listings held in {compact_bytes / 1024:,.0f} KB instead of {raw_bytes / 1024:,.0f} KB.")
+
+            # Drift summary against the training data:
+            drift_report = monitor.report()
+            if monitor.n_flagged:
+                st.warning(f"{monitor.n_flagged} of {monitor.n_rows} rows fall outside the training data. "
+                           "Check the 'Drift Risk' column before relying on their predictions.")
+            if n_skipped:
+                st.warning(f"{n_skipped} rows have missing values or categories the model has never seen, "
+                           "so they were not priced. See the 'Drift Reason' column.")
+            if (drift_report['Status'] == 'Alert').any():
+                st.warning("This file looks different from the training data. Predictions may be less reliable.")
+            with st.expander("Data Drift Report"):
+                st.dataframe(drift_report)
 
             st.markdown("### Predictions:")
             st.dataframe(user_data)
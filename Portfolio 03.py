@@ -1,210 +1,27 @@
 import gradio as gr
-import joblib
 import numpy as np
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
+from daegu_data import load_listings
+from dashboard_figures import portfolio_figures
+from warmup import GRADIO_READINESS_PORT, get_model, mark_ready, start_readiness_server, warm_up
 
-# Load the pipeline:
-model = joblib.load("xgb_daegu_apartments_pipeline.sav")
+# Report "warming up" on the readiness probe until the app is warm (own port, so it can run beside serve.py):
+start_readiness_server(GRADIO_READINESS_PORT)
 
-def data_analysis():
-    # Load data:
-    data = pd.read_csv('data_daegu_apartment.csv')
-
-    # Clean columns:
-    data['HallwayType'] = data['HallwayType'].str.strip().str.title()
-
-    # Mapping categorical columns:
-    time_rename_map = {
-        '5min~10min': '5min-10min',
-        '10min~15min': '10min-15min',
-        '15min~20min': '15min-20min',
-        'no_bus_stop_nearby': 'No Bus Stop Nearby'
-    }
-    data['TimeToSubway'] = data['TimeToSubway'].replace(time_rename_map)
-
-    subway_rename_map = {
-        'Myung-duk': 'Myung-duk',
-        'Kyungbuk_uni_hospital': 'Kyungbuk Uni Hospital',
-        'Sin-nam': 'Sin-nam',
-        'Banwoldang': 'Banwoldang',
-        'Bangoge': 'Bangoge',
-        'no_subway_nearby': 'No Subway Nearby',
-        'Chil-sung-market': 'Chil-sung Market',
-        'Daegu': 'Daegu'
-    }
-    data['SubwayStation'] = data['SubwayStation'].map(subway_rename_map)
-
-    # Bar chart: Hallway Type vs SalePrice:
-    hallway_avg = data.groupby('HallwayType')['SalePrice'].mean().reset_index()
-    fig_hallway = px.bar(
-        hallway_avg, x='HallwayType', y='SalePrice',
-        color='HallwayType',
-        color_discrete_map={
-            'Terraced': '#FF8DA1',
-            'Mixed': '#F77896',
-            'Corridor': '#FFB6C1'
-        },
-        labels={'SalePrice': 'Average Sale Price (₩)'}
-    )
-    
-    # Remove the internal title completely:
-    fig_hallway.update_layout(title=None)
-
-    # Add a centered, black Gradio title above the chart:
-    gr.Markdown("<h3 style='text-align: center; color: black;'>Hallway Type vs Sale Price</h3>")
-
-    # Display:
-    gr.Plot(fig_hallway)
-
-    # Box plot: Time to Subway:
-    time_order = ['0-5min', '5min-10min', '10min-15min', '15min-20min', 'No Bus Stop Nearby']
-    fig_time = px.box(
-        data, x='TimeToSubway', y='SalePrice',
-        category_orders={'TimeToSubway': time_order}
-    )
-    fig_time.update_traces(marker_color='#FF8DA1')
-
-    # Remove the internal title completely:
-    fig_time.update_layout(title=None)
-
-    # Add a centered, black Gradio title above the chart:
-    gr.Markdown("<h3 style='text-align: center; color: black;'>Subway Distance vs Apartment Price</h3>")
-
-    # Display:
-    gr.Plot(fig_time)
-
-    # Bar chart: Subway Station:
-    avg_price_by_station = data.groupby('SubwayStation')['SalePrice'].mean().reset_index()
-    fig_subway = px.bar(
-        avg_price_by_station, x='SubwayStation', y='SalePrice',
-        color='SubwayStation',
-        color_discrete_sequence=['#FFC0CB', '#FFB6C1', '#FF69B4', '#FF1493', '#DB7093', '#C71585', '#E75480', '#F8BBD0']
-    )
-
-    # Remove the internal title completely:
-    fig_subway.update_layout(title=None)
-
-    # Add a centered, black Gradio title above the chart:
-    gr.Markdown("<h3 style='text-align: center; color: black;'>Subway Station vs Sale Price</h3>")
-
-    # Display:
-    gr.Plot(fig_subway)
-
-    # Box plot: ETC:
-    fig_etc = px.box(data, x="N_FacilitiesNearBy(ETC)", y="SalePrice")
-    fig_etc.update_traces(marker_color="#FF8DA1")
-
-    # Remove the internal title completely:
-    fig_etc.update_layout(title=None)
-
-    # Add a centered, black Gradio title above the chart:
-    gr.Markdown("<h3 style='text-align: center; color: black;'>Nearby Facilities vs Apartment Price</h3>")
-
-    # Display:
-    gr.Plot(fig_etc)
+# Model registry (active model plus optional A/B challenger):
+model = get_model()
 
-    # Box plot: Offices:
-    fig_office = px.box(data, x="N_FacilitiesNearBy(PublicOffice)", y="SalePrice")
-    fig_office.update_traces(marker_color="#FF8DA1")
-
-    # Remove the internal title completely:
-    fig_office.update_layout(title=None)
-
-    # Add a centered, black Gradio title above the chart:
-    gr.Markdown("<h3 style='text-align: center; color: black;'>Nearby Public Offices vs Apartment Price</h3>")
-
-    # Display:
-    gr.Plot(fig_office)
-
-    # Scatter Plot with outliers:
-    Q1 = data['SalePrice'].quantile(0.25)
-    Q3 = data['SalePrice'].quantile(0.75)
-    IQR = Q3 - Q1
-    lower = Q1 - 1.5 * IQR
-    upper = Q3 + 1.5 * IQR
-    outliers = data[(data['SalePrice'] < lower) | (data['SalePrice'] > upper)]
-
-    fig_size = px.scatter(data, x="Size(sqf)", y="SalePrice",
-                      hover_data=["YearBuilt", "HallwayType"])
-    fig_size.update_traces(marker=dict(color='#FF8DA1', size=8))
-    fig_size.add_scatter(
-        x=outliers["Size(sqf)"],
-        y=outliers["SalePrice"],
-        mode="markers",
-        marker=dict(color="#FF6F91", size=10, symbol="x"),
-        name="Outliers"
-    )
-
-    # Remove the internal title completely:
-    fig_size.update_layout(title=None)
-
-    # Add a centered, black Gradio title above the chart:
-    gr.Markdown("<h3 style='text-align: center; color: black;'>Apartment Size vs Price</h3>")
-
-    # Display:
-    gr.Plot(fig_size)
-
-    # Box plot: Facilities:
-    fig_facilities = px.box(data, x="N_FacilitiesInApt", y="SalePrice")
-    fig_facilities.update_traces(marker_color="#FF8DA1")
-
-    # Remove the internal title completely:
-    fig_facilities.update_layout(title=None)
-
-    # Add a centered, black Gradio title above the chart:
-    gr.Markdown("<h3 style='text-align: center; color: black;'>In-Apt Facilities vs Price</h3>")
-
-    # Display:
-    gr.Plot(fig_facilities)
-
-    # Parallel coordinates plot:
-    fig_parallel = px.parallel_coordinates(
-        data,
-        dimensions=[
-            'Size(sqf)', 'YearBuilt', 'N_FacilitiesInApt',
-            'N_FacilitiesNearBy(ETC)', 'N_SchoolNearBy(University)'
-        ],
-        color='SalePrice',
-        color_continuous_scale=['#FFE5EC', '#FFB3D1', '#FF5CA8', '#C9184A', '#86002D']
-    )
-
-    # Remove the internal title completely:
-    fig_parallel.update_layout(title=None)
-
-    # Add a centered, black Gradio title above the chart:
-    gr.Markdown("<h3 style='text-align: center; color: black;'>Multivariate Influence on Apartment Price</h3>")
-
-    # Display:
-    gr.Plot(fig_parallel)
-
-    # Custom colour palette:
-    custom_pink_scale = ["#CF3F59", '#F77896', "#5D1B25"]
-
-    # Order TimeToSubway values:
-    time_order = ['0-5min', '5min-10min', '10min-15min', '15min-20min', 'No Bus Stop Nearby']
-
-    # Create the faceted figure:
-    fig_faceted = px.scatter(
-        data,
-        x='Size(sqf)',
-        y='SalePrice',
-        color='HallwayType',
-        facet_col='TimeToSubway',
-        facet_col_wrap=3,
-        color_discrete_sequence=custom_pink_scale,
-        category_orders={'TimeToSubway': time_order}
-    )
-
-    # Remove the internal title completely:
-    fig_faceted.update_layout(title=None)
+def data_analysis():
+    # Load and clean data:
+    data = load_listings()
 
-    # Add a centered, black Gradio title above the chart:
-    gr.Markdown("<h3 style='text-align: center; color: black;'>Sale Price vs Size Faceted by Subway Time and Hallway Type</h3>")
+    for title, fig in portfolio_figures(data):
+        # Add a centered, black Gradio title above the chart:
+        gr.Markdown(f"<h3 style='text-align: center; color: black;'>{title}</h3>")
 
-    # Display:
-    gr.Plot(fig_faceted)
+        # Display:
+        gr.Plot(fig)
 
     return "Explore the hidden stories behind square footage, hallway types, subway stations, and more."
     
@@ -366,4 +183,8 @@ with gr.Blocks(css="""
             gr.Markdown(description)
 
 if __name__ == "__main__":
-    demo.launch()
+    # Warm up before taking traffic:
+    warm_up()
+    demo.launch(prevent_thread_lock=True)
+    mark_ready()
+    demo.block_thread()
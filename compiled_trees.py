@@ -0,0 +1,199 @@
+import json
+import os
+import pickle
+
+import joblib
+import numpy as np
+import pandas as pd
+
+MODEL_PATH = 'xgb_daegu_apartments_pipeline.sav'
+COMPILED_MODEL_PATH = 'xgb_daegu_apartments_pipeline_compiled.pkl'
+
+# Inference backend picked at app startup ('xgboost' or 'compiled'):
+BACKEND = os.environ.get('DAEGU_BACKEND', 'xgboost')
+
+# Largest allowed gap against model.predict (log-price scale):
+PARITY_TOLERANCE = 1e-4
+
+
+def compile_booster(booster):
+    # Flatten every tree into padded float32 arrays (one row per tree):
+    model = json.loads(booster.save_raw('json'))['learner']
+    trees = model['gradient_booster']['model']['trees']
+    n_nodes = max(len(t['left_children']) for t in trees)
+
+    feature = np.zeros((len(trees), n_nodes), dtype=np.int32)
+    threshold = np.zeros((len(trees), n_nodes), dtype=np.float32)
+    left = np.zeros((len(trees), n_nodes), dtype=np.int32)
+    right = np.zeros((len(trees), n_nodes), dtype=np.int32)
+    default_left = np.zeros((len(trees), n_nodes), dtype=bool)
+    value = np.zeros((len(trees), n_nodes), dtype=np.float32)
+    depth = 0
+
+    for i, tree in enumerate(trees):
+        nodes = np.arange(len(tree['left_children']))
+        children_left = np.asarray(tree['left_children'])
+        is_leaf = children_left == -1
+
+        # Leaves point at themselves so extra steps leave them in place:
+        feature[i, nodes] = tree['split_indices']
+        threshold[i, nodes] = tree['split_conditions']
+        left[i, nodes] = np.where(is_leaf, nodes, children_left)
+        right[i, nodes] = np.where(is_leaf, nodes, tree['right_children'])
+        default_left[i, nodes] = np.asarray(tree['default_left'], dtype=bool)
+        value[i, nodes] = np.where(is_leaf, tree['split_conditions'], 0.0)
+
+        # Track the deepest path:
+        node_depth = np.zeros(len(nodes), dtype=np.int32)
+        for node in nodes[~is_leaf]:
+            node_depth[[children_left[node], tree['right_children'][node]]] = node_depth[node] + 1
+        depth = max(depth, int(node_depth.max()))
+
+    return {
+        'feature': feature,
+        'threshold': threshold,
+        'left': left,
+        'right': right,
+        'default_left': default_left,
+        'value': value,
+        'depth': np.int32(depth),
+        'base_score': np.float32(model['learner_model_param']['base_score'].strip('[]'))
+    }
+
+
+def predict_compiled(compiled, X):
+    # Walk all rows through all trees at once, one tree level per step:
+    X = np.asarray(X, dtype=np.float32)
+    n_trees = compiled['feature'].shape[0]
+    rows = np.arange(len(X))[:, None]
+    trees = np.arange(n_trees)[None, :]
+    node = np.zeros((len(X), n_trees), dtype=np.int32)
+
+    for _ in range(int(compiled['depth'])):
+        x = X[rows, compiled['feature'][trees, node]]
+        go_left = np.where(np.isnan(x), compiled['default_left'][trees, node], x < compiled['threshold'][trees, node])
+        node = np.where(go_left, compiled['left'][trees, node], compiled['right'][trees, node])
+
+    return compiled['value'][trees, node].sum(axis=1, dtype=np.float32) + compiled['base_score']
+
+
+def compile_column_transformer(column_transformer):
+    # Turn each fitted transformer into plain arrays: (columns, [(op, params), ...]):
+    compiled = []
+    for name, transformer, columns in column_transformer.transformers_:
+        if isinstance(transformer, str):
+            if transformer == 'drop':
+                continue
+            compiled.append((list(columns), []))
+            continue
+        steps = [step for _, step in transformer.steps] if hasattr(transformer, 'steps') else [transformer]
+        ops = []
+        for step in steps:
+            kind = type(step).__name__
+            if kind == 'OrdinalEncoder':
+                ops.append(('ordinal', [lookup(c) for c in step.categories_]))
+            elif kind == 'OneHotEncoder':
+                drop_idx = None if step.drop_idx_ is None else [None if i is None else int(i) for i in step.drop_idx_]
+                ops.append(('onehot', ([lookup(c) for c in step.categories_], drop_idx)))
+            elif kind == 'RobustScaler':
+                ops.append(('scale', (step.center_, step.scale_)))
+            elif kind == 'PolynomialFeatures':
+                ops.append(('poly', step.powers_))
+            elif kind == 'FunctionTransformer' and step.func is None:
+                # Fitted 'passthrough' (e.g. the compressed model's feature selection): no op
+                continue
+            else:
+                raise ValueError(f"Cannot compile transformer {kind} in '{name}'")
+        compiled.append((list(columns), ops))
+    return compiled
+
+
+def lookup(categories):
+    return {category: code for code, category in enumerate(categories)}
+
+
+def encode(values, codes_by_category):
+    codes = np.fromiter((codes_by_category.get(v, -1) for v in values), dtype=np.int64, count=len(values))
+    if (codes < 0).any():
+        unknown = sorted(set(str(v) for v in values[codes < 0]))
+        raise ValueError(f"Found unknown categories {unknown} during transform")
+    return codes
+
+
+def transform_compiled(compiled, X):
+    blocks = []
+    for columns, ops in compiled:
+        if isinstance(X, pd.DataFrame):
+            block = np.column_stack([X[col].to_numpy() for col in columns])
+        else:
+            block = np.asarray(X)[:, columns]
+        for op, params in ops:
+            if op == 'ordinal':
+                block = np.column_stack([encode(block[:, j], c) for j, c in enumerate(params)]).astype(float)
+            elif op == 'onehot':
+                categories, drop_idx = params
+                encoded = []
+                for j, c in enumerate(categories):
+                    one_hot = np.eye(len(c))[encode(block[:, j], c)]
+                    if drop_idx is not None and drop_idx[j] is not None:
+                        one_hot = np.delete(one_hot, drop_idx[j], axis=1)
+                    encoded.append(one_hot)
+                block = np.hstack(encoded)
+            elif op == 'scale':
+                center, scale = params
+                block = block.astype(float)
+                if center is not None:
+                    block = block - center
+                if scale is not None:
+                    block = block / scale
+            elif op == 'poly':
+                block = block.astype(float)
+                block = np.prod(block[:, None, :] ** params[None, :, :], axis=2)
+        blocks.append(np.asarray(block, dtype=float))
+    return np.hstack(blocks)
+
+
+class CompiledPipeline:
+    # Drop-in replacement for the fitted pipeline, needing only NumPy and pandas to predict.
+    def __init__(self, preprocess, trees):
+        self.preprocess = preprocess
+        self.trees = trees
+
+    def predict(self, X):
+        for step in self.preprocess:
+            X = transform_compiled(step, X)
+        return predict_compiled(self.trees, X)
+
+
+def compile_pipeline(pipeline):
+    preprocess = [compile_column_transformer(step) for _, step in pipeline.steps[:-1]]
+    return CompiledPipeline(preprocess, compile_booster(pipeline[-1].get_booster()))
+
+
+def save_compiled(compiled, path):
+    # Plain dict of arrays, so loading never needs this module's classes to be picklable:
+    joblib.dump({'preprocess': compiled.preprocess, 'trees': compiled.trees}, path)
+
+
+def load_compiled(path):
+    # Loads without sklearn or XGBoost:
+    return CompiledPipeline(**joblib.load(path))
+
+
+def check_parity(pipeline, compiled):
+    # Compare both backends on the test rows behind X_test_selected.csv:
+    from daegu_data import train_test_data  # needs sklearn, so only when checking
+    _, X_test, _, _ = train_test_data()
+    gap = np.abs(pipeline.predict(X_test) - compiled.predict(X_test)).max()
+    if gap > PARITY_TOLERANCE:
+        raise AssertionError(f"Compiled trees differ from model.predict by {gap:.2e}")
+    return gap
+
+
+if __name__ == "__main__":
+    # Compile the shipped pipeline and check it against XGBoost:
+    pipeline = pickle.load(open(MODEL_PATH, 'rb'))
+    compiled = compile_pipeline(pipeline)
+    gap = check_parity(pipeline, compiled)
+    save_compiled(compiled, COMPILED_MODEL_PATH)
+    print(f"Saved compiled pipeline to {COMPILED_MODEL_PATH} (max gap vs model.predict: {gap:.2e})")
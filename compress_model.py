@@ -0,0 +1,141 @@
+import argparse
+import pickle
+
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+from sklearn.compose import ColumnTransformer
+from sklearn.metrics import mean_absolute_error, mean_absolute_percentage_error
+from sklearn.pipeline import Pipeline
+from xgboost import XGBRegressor
+
+from compiled_trees import compile_pipeline, save_compiled
+from daegu_data import train_test_data
+
+MODEL_PATH = 'xgb_daegu_apartments_pipeline.sav'
+COMPRESSED_PATH = 'xgb_daegu_apartments_pipeline_compressed.sav'
+COMPILED_PATH = 'xgb_daegu_apartments_pipeline_compressed_compiled.pkl'
+
+# Student grid (fewer and shallower trees than the teacher):
+student_n_estimators = [25, 50]
+student_max_depth = [3, 4, 6]
+
+# Polynomial terms below this share of total gain are dropped:
+importance_threshold = 0.01
+
+
+def evaluate(y_true, y_pred_log):
+    # Metrics on the original price scale:
+    y_pred = np.expm1(y_pred_log)
+    return {
+        'MAE (₩)': mean_absolute_error(y_true, y_pred),
+        'MAPE (%)': mean_absolute_percentage_error(y_true, y_pred) * 100
+    }
+
+
+def check_test_alignment(preprocessor, X_test):
+    # Make sure the rebuilt split is the one saved in X_test_selected.csv:
+    selected = pd.read_csv('X_test_selected.csv')
+    transformed = pd.DataFrame(
+        preprocessor.transform(X_test),
+        columns=[name.split('__', 1)[1] for name in preprocessor.get_feature_names_out()]
+    )
+    return np.allclose(transformed[selected.columns].to_numpy(), selected.to_numpy())
+
+
+def low_importance_poly_terms(preprocessor, model):
+    # Squared and interaction terms with little gain:
+    names = preprocessor.get_feature_names_out()
+    importances = model.feature_importances_
+    return [
+        i for i, name in enumerate(names)
+        if name.startswith('poly__') and ('^' in name or ' ' in name) and importances[i] < importance_threshold
+    ]
+
+
+def n_nodes(model):
+    return int(model.get_booster().trees_to_dataframe().shape[0])
+
+
+def build_student(preprocessor, keep, n_estimators, max_depth):
+    steps = [('preprocess', clone(preprocessor))]
+    if keep is not None:
+        steps.append(('select', ColumnTransformer([('keep', 'passthrough', keep)])))
+    steps.append(('model', XGBRegressor(n_estimators=n_estimators, max_depth=max_depth, random_state=42)))
+    return Pipeline(steps)
+
+
+def compress(tolerance, export_float32):
+    X_train, X_test, y_train, y_test = train_test_data()
+    teacher = pickle.load(open(MODEL_PATH, 'rb'))
+    preprocessor, teacher_model = teacher.named_steps['preprocess'], teacher.named_steps['model']
+
+    if not check_test_alignment(preprocessor, X_test):
+        raise ValueError("Rebuilt test split does not match X_test_selected.csv")
+
+    baseline = evaluate(y_test, teacher.predict(X_test))
+    max_mae = baseline['MAE (₩)'] * (1 + tolerance)
+    max_mape = baseline['MAPE (%)'] * (1 + tolerance)
+
+    # Feature sets: all features, or without low-importance polynomial terms:
+    n_features = teacher_model.n_features_in_
+    dropped = low_importance_poly_terms(preprocessor, teacher_model)
+    feature_sets = {'All': None}
+    if dropped:
+        feature_sets['Reduced'] = [i for i in range(n_features) if i not in dropped]
+
+    # Distil: students learn the teacher's (log-scale) predictions on the training set:
+    y_teacher = teacher.predict(X_train)
+    results = {'Teacher': {**baseline, 'Features': n_features, 'Trees': teacher_model.n_estimators or 100,
+                           'Nodes': n_nodes(teacher_model), 'Accepted': True}}
+    candidates = {}
+    for set_name, keep in feature_sets.items():
+        for n_estimators in student_n_estimators:
+            for max_depth in student_max_depth:
+                name = f"{set_name} features, {n_estimators} trees, depth {max_depth}"
+                student = build_student(preprocessor, keep, n_estimators, max_depth)
+                student.fit(X_train, y_teacher)
+                metrics = evaluate(y_test, student.predict(X_test))
+                accepted = metrics['MAE (₩)'] <= max_mae and metrics['MAPE (%)'] <= max_mape
+                results[name] = {**metrics, 'Features': n_features if keep is None else len(keep),
+                                 'Trees': n_estimators, 'Nodes': n_nodes(student.named_steps['model']),
+                                 'Accepted': accepted}
+                if accepted:
+                    candidates[name] = student
+
+    results_df = pd.DataFrame(results).T
+    print(results_df)
+
+    # Keep the smallest accepted student:
+    if candidates:
+        best_name = min(candidates, key=lambda name: results[name]['Nodes'])
+        best = candidates[best_name]
+        pickle.dump(best, open(COMPRESSED_PATH, 'wb'))
+        print(f"\nSaved '{best_name}' to {COMPRESSED_PATH}")
+    else:
+        best = teacher
+        print(f"\nNo student stayed within {tolerance:.0%} of the teacher's MAE/MAPE, nothing saved.")
+
+    # Optional float32 compiled-tree export with its preprocessing (same guardrail),
+    # servable through the registry's 'compiled' kind:
+    if export_float32:
+        compiled = compile_pipeline(best)
+        metrics = evaluate(y_test, compiled.predict(X_test))
+        if metrics['MAE (₩)'] <= max_mae and metrics['MAPE (%)'] <= max_mape:
+            save_compiled(compiled, COMPILED_PATH)
+            print(f"Saved float32 compiled pipeline to {COMPILED_PATH} (MAE ₩{metrics['MAE (₩)']:,.0f}, "
+                  f"MAPE {metrics['MAPE (%)']:.2f}%)")
+        else:
+            print("Float32 trees fell outside the tolerance, nothing exported.")
+
+    return results_df
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compress the Daegu XGBoost pipeline.")
+    parser.add_argument('--tolerance', type=float, default=0.02,
+                        help="Allowed relative increase in test MAE and MAPE (default: 0.02)")
+    parser.add_argument('--export-float32', action='store_true',
+                        help="Also export the accepted model as a float32 compiled pipeline")
+    args = parser.parse_args()
+    compress(args.tolerance, args.export_float32)
@@ -0,0 +1,169 @@
+import os
+import shutil
+import warnings
+from contextlib import contextmanager
+
+import numpy as np
+import pandas as pd
+
+DATA_PATH = 'data_daegu_apartment.csv'
+
+# List of columns:
+categorical_columns = ['HallwayType', 'SubwayStation']
+ordinal_columns = ['TimeToSubway']
+numeric_columns = ['N_FacilitiesNearBy(ETC)', 'N_FacilitiesNearBy(PublicOffice)',
+                   'N_SchoolNearBy(University)', 'N_Parkinglot(Basement)', 'YearBuilt',
+                   'N_FacilitiesInApt', 'Size(sqf)']
+feature_columns = ['HallwayType', 'TimeToSubway', 'SubwayStation'] + numeric_columns
+target_column = 'SalePrice'
+
+# Compact dtypes (signed: Plotly drops unsigned columns from parallel coordinates), the dtypes
+# the model was trained on, and the ranges the app sliders assume:
+column_schema = {
+    'HallwayType': {'dtype': 'category', 'model_dtype': 'object'},
+    'TimeToSubway': {'dtype': 'category', 'model_dtype': 'object'},
+    'SubwayStation': {'dtype': 'category', 'model_dtype': 'object'},
+    'N_FacilitiesNearBy(ETC)': {'dtype': 'int8', 'model_dtype': 'float64', 'min': 0, 'max': 5},
+    'N_FacilitiesNearBy(PublicOffice)': {'dtype': 'int8', 'model_dtype': 'float64', 'min': 0, 'max': 7},
+    'N_SchoolNearBy(University)': {'dtype': 'int8', 'model_dtype': 'float64', 'min': 0, 'max': 5},
+    'N_Parkinglot(Basement)': {'dtype': 'int16', 'model_dtype': 'float64', 'min': 0, 'max': 1321},
+    'YearBuilt': {'dtype': 'int16', 'model_dtype': 'int64', 'min': 1978, 'max': 2015},
+    'N_FacilitiesInApt': {'dtype': 'int8', 'model_dtype': 'int64', 'min': 1, 'max': 10},
+    'Size(sqf)': {'dtype': 'int16', 'model_dtype': 'int64', 'min': 135, 'max': 2337},
+    'SalePrice': {'dtype': 'int32', 'model_dtype': 'int64'}
+}
+
+# Mapping categorical columns:
+time_rename_map = {
+    '5min~10min': '5min-10min',
+    '10min~15min': '10min-15min',
+    '15min~20min': '15min-20min',
+    'no_bus_stop_nearby': 'No Bus Stop Nearby'
+}
+subway_rename_map = {
+    'Myung-duk': 'Myung-duk',
+    'Kyungbuk_uni_hospital': 'Kyungbuk Uni Hospital',
+    'Sin-nam': 'Sin-nam',
+    'Banwoldang': 'Banwoldang',
+    'Bangoge': 'Bangoge',
+    'no_subway_nearby': 'No Subway Nearby',
+    'Chil-sung-market': 'Chil-sung Market',
+    'Daegu': 'Daegu'
+}
+
+
+def clean_listings(data):
+    # Apply renaming to match the training data:
+    data = data.copy()
+    if 'HallwayType' in data.columns:
+        data['HallwayType'] = data['HallwayType'].str.strip().str.title()
+    if 'TimeToSubway' in data.columns:
+        data['TimeToSubway'] = data['TimeToSubway'].replace(time_rename_map)
+    if 'SubwayStation' in data.columns:
+        data['SubwayStation'] = data['SubwayStation'].replace(subway_rename_map)
+    return data
+
+
+@contextmanager
+def atomic_write(path, directory=False):
+    # Yield a temporary file (or folder) next to path; it replaces path only once the block succeeds,
+    # so readers never see a partial write:
+    tmp = f'{path}.{os.getpid()}.tmp'
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    if directory:
+        os.makedirs(tmp)
+    try:
+        yield tmp
+        os.replace(tmp, path)
+    except BaseException:
+        if directory:
+            shutil.rmtree(tmp, ignore_errors=True)
+        elif os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def fits_dtype(values, dtype):
+    # Whole numbers, no gaps, within the dtype's limits, so the cast loses nothing:
+    limits = np.iinfo(dtype)
+    return (values.notna().all() and (values % 1 == 0).all()
+            and values.min() >= limits.min and values.max() <= limits.max)
+
+
+def compact_listings(data):
+    # Downcast schema columns; columns that would not survive the cast keep their dtype:
+    data = data.copy()
+    for col, schema in column_schema.items():
+        if col not in data.columns:
+            continue
+        if schema['dtype'] == 'category':
+            data[col] = data[col].astype('category')
+            continue
+        values = pd.to_numeric(data[col], errors='coerce')
+        if len(values) and fits_dtype(values, schema['dtype']):
+            data[col] = values.astype(schema['dtype'])
+    return data
+
+
+def model_input(data):
+    # Restore the training dtypes on compacted columns (unchanged frames are passed through):
+    compacted = [col for col, schema in column_schema.items()
+                 if col in data.columns and data[col].dtype == schema['dtype']]
+    if not compacted:
+        return data
+    return data.astype({col: column_schema[col]['model_dtype'] for col in compacted})
+
+
+def out_of_range(data):
+    # Rows per column outside the slider ranges:
+    counts = {}
+    for col, schema in column_schema.items():
+        if col in data.columns and 'min' in schema:
+            values = pd.to_numeric(data[col], errors='coerce')
+            counts[col] = int(((values < schema['min']) | (values > schema['max'])).sum())
+    return pd.Series(counts, name='Rows Out of Range')
+
+
+def memory_report(before, after):
+    # Deep memory per column before and after compacting:
+    report = pd.DataFrame({
+        'Dtype': after.dtypes.astype(str),
+        'Before (KB)': before.memory_usage(deep=True, index=False) / 1024,
+        'After (KB)': after.memory_usage(deep=True, index=False) / 1024
+    })
+    report.loc['Total'] = ['', report['Before (KB)'].sum(), report['After (KB)'].sum()]
+    report['Ratio'] = report['Before (KB)'] / report['After (KB)']
+    return report.round(1)
+
+
+def load_listings(path=DATA_PATH):
+    # Raw rows (duplicates kept), cleaned and compacted; rows outside the slider ranges are kept but reported:
+    data = compact_listings(clean_listings(pd.read_csv(path)))
+    outside = out_of_range(data)
+    if outside.any():
+        warnings.warn(f"{path} has values outside the slider ranges: {outside[outside > 0].to_dict()}")
+    return data
+
+
+def load_dataset(path=DATA_PATH):
+    # Load, standardise and drop duplicates as in the notebook:
+    data = pd.read_csv(path)
+    data = clean_listings(data)
+    return data.drop_duplicates().reset_index(drop=True)
+
+
+def train_test_data(path=DATA_PATH):
+    # Same split as the notebook (X_test matches X_test_selected.csv row for row):
+    from sklearn.model_selection import train_test_split  # kept out of the compiled serving path
+    data = load_dataset(path)
+    X = data.drop(columns=[target_column])
+    y = data[target_column]
+    return train_test_split(X, y, test_size=0.2, random_state=42)
+
+
+if __name__ == "__main__":
+    raw = clean_listings(pd.read_csv(DATA_PATH))
+    data = load_listings()
+    print(memory_report(raw, data))
+    print()
+    print(out_of_range(data))
@@ -0,0 +1,201 @@
+import plotly.express as px
+
+# Shared colours and orderings:
+time_order = ['0-5min', '5min-10min', '10min-15min', '15min-20min', 'No Bus Stop Nearby']
+hallway_colours = {
+    'Terraced': '#FF8DA1',
+    'Mixed': '#F77896',
+    'Corridor': '#FFB6C1'
+}
+custom_pinks = ['#FFC0CB', '#FFB6C1', '#FF69B4', '#FF1493', '#DB7093', '#C71585', '#E75480', '#F8BBD0']
+parallel_scale = ['#FFE5EC', '#FFB3D1', '#FF5CA8', '#C9184A', '#86002D']
+faceted_pinks = ["#CF3F59", '#F77896', "#5D1B25"]
+parallel_dimensions = [
+    'Size(sqf)', 'YearBuilt', 'N_FacilitiesInApt',
+    'N_FacilitiesNearBy(ETC)', 'N_SchoolNearBy(University)'
+]
+
+
+def outlier_rows(data):
+    # SalePrice outliers by IQR:
+    Q1 = data['SalePrice'].quantile(0.25)
+    Q3 = data['SalePrice'].quantile(0.75)
+    IQR = Q3 - Q1
+    lower, upper = Q1 - 1.5 * IQR, Q3 + 1.5 * IQR
+    return data[(data['SalePrice'] < lower) | (data['SalePrice'] > upper)]
+
+
+def capstone_figures(data):
+    # Figures for the Streamlit "Data Deep Dive" page, in display order:
+    figures = {}
+
+    # Bar Chart | Hallway Type:
+    avg_price_by_hallway = data.groupby('HallwayType', as_index=False, observed=True)['SalePrice'].mean()
+    figures['hallway'] = px.bar(
+        avg_price_by_hallway, x='HallwayType', y='SalePrice',
+        labels={'SalePrice': 'Average Sale Price (₩)'},
+        color='HallwayType',
+        color_discrete_map=hallway_colours
+    )
+
+    # Box Plot | Time to Subway:
+    fig = px.box(
+        data, x='TimeToSubway', y='SalePrice',
+        category_orders={'TimeToSubway': time_order}
+    )
+    fig.update_traces(marker_color='#FF8DA1')
+    figures['time_to_subway'] = fig
+
+    # Bar Chart | Subway Station:
+    avg_price_by_station = data.groupby('SubwayStation', as_index=False, observed=True)['SalePrice'].mean()
+    figures['subway_station'] = px.bar(
+        avg_price_by_station, x='SubwayStation', y='SalePrice',
+        labels={'SalePrice': 'Average Sale Price (₩)'},
+        color='SubwayStation',
+        color_discrete_sequence=custom_pinks
+    )
+
+    # Reusable Box Plot:
+    def box_plot(x_col, title):
+        fig = px.box(data, x=x_col, y='SalePrice', title=title)
+        fig.update_traces(marker_color='#FF8DA1')
+        return fig
+
+    figures['facilities_etc'] = box_plot('N_FacilitiesNearBy(ETC)', "Nearby Facilities vs Apartment Prices: More Shops, More Won?")
+    figures['public_office'] = box_plot('N_FacilitiesNearBy(PublicOffice)', "Nearby Public Offices vs Apartment Prices: Do Public Offices Boost Prices?")
+    figures['university'] = box_plot('N_SchoolNearBy(University)', "Nearby Universities vs Apartment Prices: Are Apartments Near Universities Worth More?")
+    figures['facilities_in_apt'] = box_plot('N_FacilitiesInApt', "Apartment Facilities vs Apartment Prices: Do More Facilities Mean Higher Prices?")
+
+    # Scatter Plot with Trendline and Outliers:
+    outliers = outlier_rows(data)
+
+    def scatter_outlier_plot(x_col, title):
+        fig = px.scatter(
+            data, x=x_col, y='SalePrice',
+            title=title,
+            hover_data=['HallwayType', 'TimeToSubway', 'SubwayStation', 'YearBuilt'],
+            trendline='ols',
+            trendline_color_override='red'
+        )
+        fig.update_traces(marker=dict(color='#FF8DA1', size=8))
+        fig.add_scatter(
+            x=outliers[x_col], y=outliers['SalePrice'], mode='markers',
+            marker=dict(color='#FF6F91', size=10, symbol='x'), name='Outliers'
+        )
+        return fig
+
+    figures['parking'] = scatter_outlier_plot('N_Parkinglot(Basement)', "Basement Parking Spaces vs Apartment Prices: Do More Basement Parking Spaces Drive Up Prices?")
+    figures['year_built'] = scatter_outlier_plot('YearBuilt', "Year Built vs Apartment Prices: How Much Does Year Built Matter?")
+    figures['size'] = scatter_outlier_plot('Size(sqf)', "Apartment Size vs Apartment Prices: Bigger Means Pricier? Let's See!")
+
+    # Parallel Coordinates:
+    fig = px.parallel_coordinates(
+        data,
+        dimensions=parallel_dimensions,
+        color='SalePrice',
+        color_continuous_scale=parallel_scale,
+    )
+    fig.update_layout(
+        margin=dict(l=50, r=50, t=50, b=50),
+        width=900
+    )
+    figures['parallel'] = fig
+
+    # Faceted Plot:
+    figures['faceted'] = px.scatter(
+        data,
+        x='Size(sqf)',
+        y='SalePrice',
+        color='HallwayType',
+        facet_col='TimeToSubway',
+        facet_col_wrap=3,
+        color_discrete_sequence=faceted_pinks,
+        category_orders={'TimeToSubway': time_order},
+        title='Sale Price vs Size Faceted by Subway Time and Hallway Type'
+    )
+    return figures
+
+
+def portfolio_figures(data):
+    # Figures for the Gradio "Explore Data" tab as (title, figure), in display order:
+    figures = []
+
+    # Bar chart: Hallway Type vs SalePrice:
+    hallway_avg = data.groupby('HallwayType', observed=True)['SalePrice'].mean().reset_index()
+    fig = px.bar(
+        hallway_avg, x='HallwayType', y='SalePrice',
+        color='HallwayType',
+        color_discrete_map=hallway_colours,
+        labels={'SalePrice': 'Average Sale Price (₩)'}
+    )
+    figures.append(("Hallway Type vs Sale Price", fig))
+
+    # Box plot: Time to Subway:
+    fig = px.box(
+        data, x='TimeToSubway', y='SalePrice',
+        category_orders={'TimeToSubway': time_order}
+    )
+    fig.update_traces(marker_color='#FF8DA1')
+    figures.append(("Subway Distance vs Apartment Price", fig))
+
+    # Bar chart: Subway Station:
+    avg_price_by_station = data.groupby('SubwayStation', observed=True)['SalePrice'].mean().reset_index()
+    fig = px.bar(
+        avg_price_by_station, x='SubwayStation', y='SalePrice',
+        color='SubwayStation',
+        color_discrete_sequence=custom_pinks
+    )
+    figures.append(("Subway Station vs Sale Price", fig))
+
+    # Box plots: ETC and Offices:
+    for x_col, title in [("N_FacilitiesNearBy(ETC)", "Nearby Facilities vs Apartment Price"),
+                         ("N_FacilitiesNearBy(PublicOffice)", "Nearby Public Offices vs Apartment Price")]:
+        fig = px.box(data, x=x_col, y="SalePrice")
+        fig.update_traces(marker_color="#FF8DA1")
+        figures.append((title, fig))
+
+    # Scatter Plot with outliers:
+    outliers = outlier_rows(data)
+    fig = px.scatter(data, x="Size(sqf)", y="SalePrice",
+                     hover_data=["YearBuilt", "HallwayType"])
+    fig.update_traces(marker=dict(color='#FF8DA1', size=8))
+    fig.add_scatter(
+        x=outliers["Size(sqf)"],
+        y=outliers["SalePrice"],
+        mode="markers",
+        marker=dict(color="#FF6F91", size=10, symbol="x"),
+        name="Outliers"
+    )
+    figures.append(("Apartment Size vs Price", fig))
+
+    # Box plot: Facilities:
+    fig = px.box(data, x="N_FacilitiesInApt", y="SalePrice")
+    fig.update_traces(marker_color="#FF8DA1")
+    figures.append(("In-Apt Facilities vs Price", fig))
+
+    # Parallel coordinates plot:
+    fig = px.parallel_coordinates(
+        data,
+        dimensions=parallel_dimensions,
+        color='SalePrice',
+        color_continuous_scale=parallel_scale
+    )
+    figures.append(("Multivariate Influence on Apartment Price", fig))
+
+    # Faceted figure:
+    fig = px.scatter(
+        data,
+        x='Size(sqf)',
+        y='SalePrice',
+        color='HallwayType',
+        facet_col='TimeToSubway',
+        facet_col_wrap=3,
+        color_discrete_sequence=faceted_pinks,
+        category_orders={'TimeToSubway': time_order}
+    )
+    figures.append(("Sale Price vs Size Faceted by Subway Time and Hallway Type", fig))
+
+    # Remove the internal titles completely (the app adds its own):
+    for _, fig in figures:
+        fig.update_layout(title=None)
+    return figures
@@ -0,0 +1,176 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from daegu_data import categorical_columns, ordinal_columns, numeric_columns, train_test_data
+
+REFERENCE_PATH = 'drift_reference_daegu_apartments.json'
+
+# Number of quantile bins per numeric column:
+N_BINS = 10
+
+# PSI / KS thresholds:
+PSI_WARNING = 0.1
+PSI_ALERT = 0.25
+KS_ALERT = 0.2
+
+# Uploads smaller than this are too noisy for PSI / KS:
+MIN_ROWS = 100
+
+# Floor for empty bins so PSI stays finite:
+EPSILON = 1e-4
+
+category_columns = ordinal_columns + categorical_columns
+
+
+def build_reference(data):
+    # Store quantile cut points and bin shares for numeric columns:
+    reference = {'numeric': {}, 'categorical': {}, 'n_rows': int(len(data))}
+    for col in numeric_columns:
+        values = data[col].dropna().to_numpy(dtype=float)
+        quantiles = np.quantile(values, np.linspace(0, 1, N_BINS + 1))
+        cuts = np.unique(quantiles[1:-1])
+        counts = np.bincount(np.searchsorted(cuts, values, side='right'), minlength=len(cuts) + 1)
+        reference['numeric'][col] = {
+            'cuts': cuts.tolist(),
+            'proportions': (counts / counts.sum()).tolist(),
+            'min': float(values.min()),
+            'max': float(values.max())
+        }
+
+    # Store category frequencies (the last slot counts unseen categories):
+    for col in category_columns:
+        frequencies = data[col].value_counts(normalize=True)
+        reference['categorical'][col] = {
+            'categories': frequencies.index.tolist(),
+            'proportions': frequencies.tolist() + [0.0]
+        }
+    return reference
+
+
+def save_reference(reference, path=REFERENCE_PATH):
+    with open(path, 'w') as f:
+        json.dump(reference, f, indent=2)
+
+
+def load_reference(path=REFERENCE_PATH):
+    # Fall back to the training split when no sketch has been saved yet:
+    if not os.path.exists(path):
+        return build_reference(train_test_data()[0])
+    with open(path) as f:
+        return json.load(f)
+
+
+def psi(expected, actual):
+    expected = np.clip(expected, EPSILON, None)
+    actual = np.clip(actual, EPSILON, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def ks(expected, actual):
+    # KS distance on the binned CDFs:
+    return float(np.max(np.abs(np.cumsum(expected) - np.cumsum(actual))))
+
+
+class DriftMonitor:
+    def __init__(self, reference):
+        self.reference = reference
+        self.numeric = [c for c in numeric_columns if c in reference['numeric']]
+        self.categorical = [c for c in category_columns if c in reference['categorical']]
+
+        # Lay all bins out in one flat count vector so each chunk is a single bincount:
+        sizes = [len(reference['numeric'][c]['proportions']) for c in self.numeric] + \
+                [len(reference['categorical'][c]['proportions']) for c in self.categorical]
+        self.offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+        self.counts = np.zeros(int(np.sum(sizes)), dtype=np.int64)
+        self.n_rows = 0
+        self.n_flagged = 0
+
+        self.lower = np.array([reference['numeric'][c]['min'] for c in self.numeric])
+        self.upper = np.array([reference['numeric'][c]['max'] for c in self.numeric])
+
+    def update(self, chunk):
+        n = len(chunk)
+        columns = self.numeric + self.categorical
+        bins = np.empty((n, len(columns)), dtype=np.int64)
+        risky = np.zeros((n, len(columns)), dtype=bool)
+        # Rows the model cannot encode (missing values, unseen categories):
+        blocking = np.zeros((n, len(columns)), dtype=bool)
+
+        # Numeric columns: bin index and out-of-training-range flag (text counts as missing):
+        if self.numeric:
+            values = np.column_stack([
+                pd.to_numeric(chunk[col], errors='coerce').to_numpy(dtype=float) if col in chunk.columns
+                else np.full(n, np.nan)
+                for col in self.numeric
+            ])
+            for j, col in enumerate(self.numeric):
+                bins[:, j] = np.searchsorted(self.reference['numeric'][col]['cuts'], values[:, j], side='right')
+            missing = np.isnan(values)
+            with np.errstate(invalid='ignore'):
+                risky[:, :len(self.numeric)] = missing | (values < self.lower) | (values > self.upper)
+            blocking[:, :len(self.numeric)] = missing
+
+        # Categorical columns: unseen or missing values go to the last slot:
+        for j, col in enumerate(self.categorical, start=len(self.numeric)):
+            known = self.reference['categorical'][col]['categories']
+            if col in chunk.columns:
+                codes = pd.Categorical(chunk[col], categories=known).codes.astype(np.int64)
+            else:
+                codes = np.full(n, -1, dtype=np.int64)
+            unseen = codes < 0
+            codes[unseen] = len(known)
+            bins[:, j] = codes
+            risky[:, j] = unseen
+            blocking[:, j] = unseen
+
+        # Missing numeric values are not binned:
+        valid = ~np.isnan(values) if self.numeric else np.ones((n, 0), dtype=bool)
+        valid = np.hstack([valid, np.ones((n, len(self.categorical)), dtype=bool)])
+        flat = (bins + self.offsets)[valid]
+        self.counts += np.bincount(flat, minlength=len(self.counts))
+
+        # Flag risky rows with the offending columns:
+        flagged = risky.any(axis=1)
+        reasons = np.full(n, '', dtype=object)
+        for j, col in enumerate(columns):
+            reasons[blocking[:, j]] += f'{col} (missing or unseen); '
+            reasons[risky[:, j] & ~blocking[:, j]] += f'{col} (outside training range); '
+        self.n_rows += n
+        self.n_flagged += int(flagged.sum())
+
+        return pd.DataFrame({
+            'Drift Risk': flagged,
+            'Drift Reason': pd.Series(reasons).str.rstrip('; ').to_numpy(),
+            'Scorable': ~blocking.any(axis=1)
+        }, index=chunk.index)
+
+    def report(self):
+        rows = []
+        columns = [(c, 'numeric') for c in self.numeric] + [(c, 'categorical') for c in self.categorical]
+        for (col, kind), offset in zip(columns, self.offsets):
+            expected = np.asarray(self.reference[kind][col]['proportions'])
+            counts = self.counts[offset:offset + len(expected)]
+            if counts.sum() == 0:
+                continue
+            actual = counts / counts.sum()
+            col_psi = psi(expected, actual)
+            col_ks = ks(expected, actual) if kind == 'numeric' else np.nan
+            if counts.sum() < MIN_ROWS:
+                status = 'Too Few Rows'
+            elif col_psi >= PSI_ALERT or (kind == 'numeric' and col_ks >= KS_ALERT):
+                status = 'Alert'
+            elif col_psi >= PSI_WARNING:
+                status = 'Warning'
+            else:
+                status = 'OK'
+            rows.append({'Column': col, 'PSI': col_psi, 'KS': col_ks, 'Status': status})
+        return pd.DataFrame(rows, columns=['Column', 'PSI', 'KS', 'Status'])
+
+
+if __name__ == "__main__":
+    # Build the reference sketches from the rows the model was trained on:
+    save_reference(build_reference(train_test_data()[0]))
+    print(f"Saved drift reference to {REFERENCE_PATH}")
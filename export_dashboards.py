@@ -0,0 +1,200 @@
+import argparse
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+from plotly.offline import get_plotlyjs
+
+from daegu_data import DATA_PATH, atomic_write, load_listings
+from dashboard_figures import capstone_figures, portfolio_figures
+
+EXPORT_DIR = 'static_dashboards'
+
+# Bump when the exported figures change shape, to force a rebuild:
+EXPORT_VERSION = 1
+
+# Most points kept per scatter trace / parallel-coordinates plot:
+MAX_POINTS = 1000
+
+# Section titles for the Streamlit charts (the app shows them as banners):
+capstone_titles = {
+    'hallway': "Hallway Types vs Apartment Prices: Does the Layout Pay Off?",
+    'time_to_subway': "Subway Distance vs Apartment Prices: How Far Is Too Far?",
+    'subway_station': "Stop vs Apartment Prices: Which Subway Stations Are Real Estate Hotspots?",
+    'facilities_etc': "Convenience Counts: Nearby Facilities",
+    'public_office': "Convenience Counts: Nearby Public Offices",
+    'university': "Convenience Counts: Nearby Universities",
+    'facilities_in_apt': "Inside Scoop: Do More In-Apt Facilities Mean Higher Prices?",
+    'parking': "Parking, Age, Size: Basement Parking Spaces",
+    'year_built': "Parking, Age, Size: Year Built",
+    'size': "Parking, Age, Size: Apartment Size",
+    'parallel': "Multi-Factor Analysis: What Factors Cluster with Price?",
+    'faceted': "Space, Style, and Subway: How Layout and Transit Access Shape Prices"
+}
+
+
+def data_hash(path=DATA_PATH):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        digest.update(f.read())
+    digest.update(str(EXPORT_VERSION).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def aggregate_box(trace):
+    # Replace raw points with precomputed box statistics per category:
+    points = pd.DataFrame({'x': np.asarray(trace.x), 'y': np.asarray(trace.y, dtype=float)})
+    stats = []
+    for category, y in points.groupby('x', sort=False)['y']:
+        q1, median, q3 = np.percentile(y, [25, 50, 75])
+        iqr = q3 - q1
+        stats.append({
+            'x': category, 'q1': q1, 'median': median, 'q3': q3,
+            'lowerfence': y[y >= q1 - 1.5 * iqr].min(),
+            'upperfence': y[y <= q3 + 1.5 * iqr].max()
+        })
+    stats = pd.DataFrame(stats)
+    trace.update(
+        x=stats['x'].tolist(), y=None, q1=stats['q1'].tolist(), median=stats['median'].tolist(),
+        q3=stats['q3'].tolist(), lowerfence=stats['lowerfence'].tolist(),
+        upperfence=stats['upperfence'].tolist(), boxpoints=False
+    )
+
+
+def sample_index(n, rng):
+    return np.sort(rng.choice(n, MAX_POINTS, replace=False)) if n > MAX_POINTS else np.arange(n)
+
+
+def downsample_scatter(trace, rng):
+    # Drop points that draw on top of each other, then sample what is left:
+    x, y = np.asarray(trace.x), np.asarray(trace.y)
+    _, keep = np.unique(np.column_stack([x.astype(str), y.astype(str)]), axis=0, return_index=True)
+    keep = np.sort(keep)
+    keep = keep[sample_index(len(keep), rng)]
+    updates = {'x': x[keep], 'y': y[keep]}
+    for field in ['customdata', 'hovertext', 'text']:
+        values = trace[field]
+        if values is not None and not isinstance(values, str) and len(values) == len(x):
+            updates[field] = np.asarray(values)[keep]
+    trace.update(**updates)
+
+
+def trim_trendline(trace):
+    # A straight OLS line only needs its two end points:
+    trace.update(x=[trace.x[0], trace.x[-1]], y=[trace.y[0], trace.y[-1]])
+
+
+def downsample_parcoords(trace, rng):
+    n = len(trace.dimensions[0].values)
+    keep = sample_index(n, rng)
+    for dimension in trace.dimensions:
+        dimension.values = np.asarray(dimension.values)[keep]
+    if trace.line.color is not None and not isinstance(trace.line.color, str):
+        trace.line.color = np.asarray(trace.line.color)[keep]
+
+
+def slim_figure(fig, seed=42):
+    rng = np.random.default_rng(seed)
+    for trace in fig.data:
+        if trace.type == 'box':
+            aggregate_box(trace)
+        elif trace.type in ('scatter', 'scattergl') and trace.mode == 'markers' and trace.x is not None:
+            downsample_scatter(trace, rng)
+        elif trace.type in ('scatter', 'scattergl') and 'OLS trendline' in (trace.hovertemplate or ''):
+            trim_trendline(trace)
+        elif trace.type == 'parcoords':
+            downsample_parcoords(trace, rng)
+    return fig
+
+
+index_html = """<!doctype html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>Daegu Deals: Explore the Data</title>
+<script src="plotly.min.js"></script>
+<style>
+  body { background-color: #fff0f6; font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; margin: 0 auto; max-width: 1100px; }
+  h1 { color: #ff8da1; text-align: center; }
+  h2 { background-color: #E79898; color: #FFFFFF; padding: 12px; border-radius: 10px; text-align: center; }
+  h3 { text-align: center; }
+</style>
+</head>
+<body>
+<h1>Daegu Deals: What's Really Driving Apartment Prices in Daegu?</h1>
+<div id="dashboards"></div>
+<script>
+fetch('manifest.json').then(r => r.json()).then(manifest => {
+  const root = document.getElementById('dashboards');
+  for (const app of manifest.apps) {
+    const heading = document.createElement('h2');
+    heading.textContent = app.title;
+    root.appendChild(heading);
+    for (const figure of app.figures) {
+      const title = document.createElement('h3');
+      title.textContent = figure.title;
+      const div = document.createElement('div');
+      root.append(title, div);
+      fetch(figure.file).then(r => r.json()).then(fig =>
+        Plotly.newPlot(div, fig.data, fig.layout, {responsive: true}));
+    }
+  }
+});
+</script>
+</body>
+</html>
+"""
+
+
+def export(export_dir=EXPORT_DIR, force=False):
+    # Skip when the data (and export format) has not changed:
+    current_hash = data_hash()
+    manifest_path = os.path.join(export_dir, 'manifest.json')
+    if not force and os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            if json.load(f).get('data_hash') == current_hash:
+                print(f"{export_dir}/ is up to date with {DATA_PATH}")
+                return False
+
+    data = load_listings()
+    apps = [
+        ("Data Deep Dive", 'capstone',
+         [(capstone_titles[key], fig) for key, fig in capstone_figures(data).items()]),
+        ("Explore Data", 'portfolio', portfolio_figures(data))
+    ]
+
+    # Build into a fresh folder, then swap it in:
+    with atomic_write(export_dir, directory=True) as tmp_dir:
+        os.makedirs(os.path.join(tmp_dir, 'figures'))
+        with open(os.path.join(tmp_dir, 'plotly.min.js'), 'w', encoding='utf-8') as f:
+            f.write(get_plotlyjs())
+        with open(os.path.join(tmp_dir, 'index.html'), 'w', encoding='utf-8') as f:
+            f.write(index_html)
+
+        manifest = {'data_hash': current_hash, 'apps': []}
+        for app_title, prefix, figures in apps:
+            entries = []
+            for i, (title, fig) in enumerate(figures):
+                file = f'figures/{prefix}_{i:02d}.json'
+                with open(os.path.join(tmp_dir, file), 'w', encoding='utf-8') as f:
+                    f.write(slim_figure(fig).to_json())
+                entries.append({'title': title, 'file': file})
+            manifest['apps'].append({'title': app_title, 'figures': entries})
+        with open(os.path.join(tmp_dir, 'manifest.json'), 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        # A folder can only be renamed over an empty one:
+        shutil.rmtree(export_dir, ignore_errors=True)
+    print(f"Exported {sum(len(app['figures']) for app in manifest['apps'])} figures to {export_dir}/")
+    return True
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the analysis dashboards as a static bundle.")
+    parser.add_argument('--output', default=EXPORT_DIR, help=f"Output folder (default: {EXPORT_DIR})")
+    parser.add_argument('--force', action='store_true', help="Rebuild even if the data has not changed")
+    args = parser.parse_args()
+    export(args.output, args.force)
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.compose import ColumnTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.preprocessing import OneHotEncoder, OrdinalEncoder, PolynomialFeatures, RobustScaler
+
+from daegu_data import DATA_PATH, atomic_write, categorical_columns, numeric_columns, ordinal_columns, train_test_data
+
+CACHE_DIR = 'feature_cache'
+
+# Preprocessing config (part of the cache key):
+preprocessing_config = {
+    'ordinal_columns': ordinal_columns,
+    'categorical_columns': categorical_columns,
+    'numeric_columns': numeric_columns,
+    'poly_columns': ['Size(sqf)', 'N_Parkinglot(Basement)', 'N_FacilitiesInApt', 'YearBuilt'],
+    'poly_degree': 2,
+    'correlation_threshold': 0.9,
+    'test_size': 0.2,
+    'random_state': 42,
+    'sklearn_version': sklearn.__version__
+}
+
+# Arrays stored as .npy so they can be memory-mapped:
+array_names = ['X_train_selected', 'X_test_selected', 'y_train', 'y_test', 'y_train_log', 'y_test_log',
+               'correlation_matrix']
+
+
+def build_preprocessor(config):
+    # Preprocessor pipeline:
+    other_numeric_columns = [col for col in config['numeric_columns'] if col not in config['poly_columns']]
+    return ColumnTransformer(
+        transformers=[
+            ('ordinal', OrdinalEncoder(), config['ordinal_columns']),
+            ('onehot', OneHotEncoder(drop='first'), config['categorical_columns']),
+            ('scaler_numeric', RobustScaler(), other_numeric_columns),
+            ('poly', Pipeline([
+                ('scale', RobustScaler()),
+                ('poly', PolynomialFeatures(degree=config['poly_degree'], include_bias=False))
+            ]), config['poly_columns'])
+        ]
+    )
+
+
+def get_feature_names(preprocessor, poly_columns):
+    # Helper function to extract all transformed feature names:
+    feature_names = []
+    for name, transformer, cols in preprocessor.transformers_:
+        if transformer == 'drop':
+            continue
+        elif name == 'onehot':
+            feature_names.extend(transformer.get_feature_names_out(cols))
+        elif name == 'poly':
+            poly_step = transformer.named_steps['poly']
+            feature_names.extend(poly_step.get_feature_names_out(poly_columns))
+        elif isinstance(cols, (list, np.ndarray)):
+            feature_names.extend(cols)
+        else:
+            feature_names.append(cols)
+    return list(feature_names)
+
+
+def remove_highly_correlated_features(corr_matrix, threshold=0.9):
+    # Drop the later column of every pair above the threshold:
+    upper_tri = corr_matrix.where(np.triu(np.ones(corr_matrix.shape), k=1).astype(bool))
+    return [column for column in upper_tri.columns if (upper_tri[column].abs() > threshold).any()]
+
+
+def cache_key(data_path=DATA_PATH, config=preprocessing_config):
+    # Raw data hash + preprocessing config:
+    digest = hashlib.sha256()
+    with open(data_path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    digest.update(json.dumps(config, sort_keys=True).encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def build_features(data_path=DATA_PATH, config=preprocessing_config):
+    # Split, fit and transform as in the notebook:
+    X_train, X_test, y_train, y_test = train_test_data(data_path)
+    preprocessor = build_preprocessor(config)
+    X_train_transformed = preprocessor.fit_transform(X_train)
+    X_test_transformed = preprocessor.transform(X_test)
+    column_names = get_feature_names(preprocessor, config['poly_columns'])
+
+    # Correlation filter:
+    X_train_df = pd.DataFrame(X_train_transformed, columns=column_names)
+    correlation_matrix = X_train_df.corr()
+    to_drop = remove_highly_correlated_features(correlation_matrix, config['correlation_threshold'])
+    keep = [i for i, col in enumerate(column_names) if col not in to_drop]
+
+    arrays = {
+        'X_train_selected': np.ascontiguousarray(X_train_transformed[:, keep]),
+        'X_test_selected': np.ascontiguousarray(X_test_transformed[:, keep]),
+        'y_train': y_train.to_numpy(),
+        'y_test': y_test.to_numpy(),
+        'y_train_log': np.log1p(y_train.to_numpy()),
+        'y_test_log': np.log1p(y_test.to_numpy()),
+        'correlation_matrix': correlation_matrix.to_numpy()
+    }
+    meta = {
+        'column_names': column_names,
+        'to_drop': to_drop,
+        'selected_columns': [column_names[i] for i in keep],
+        'config': config
+    }
+    return arrays, meta, preprocessor
+
+
+def write_cache(path, arrays, meta, preprocessor):
+    try:
+        with atomic_write(path, directory=True) as tmp:
+            for name, array in arrays.items():
+                np.save(os.path.join(tmp, f'{name}.npy'), array)
+            with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+                json.dump(meta, f, indent=2)
+            joblib.dump(preprocessor, os.path.join(tmp, 'preprocessor.pkl'))
+    except OSError:
+        # Another process may have written the same key first:
+        if not os.path.isdir(path):
+            raise
+
+
+def load_features(data_path=DATA_PATH, config=preprocessing_config, cache_dir=CACHE_DIR):
+    path = os.path.join(cache_dir, cache_key(data_path, config))
+    if not os.path.isdir(path):
+        write_cache(path, *build_features(data_path, config))
+
+    # Memory-map the arrays; the DataFrames wrap them without copying:
+    with open(os.path.join(path, 'meta.json')) as f:
+        meta = json.load(f)
+    arrays = {name: np.load(os.path.join(path, f'{name}.npy'), mmap_mode='r') for name in array_names}
+    selected = meta['selected_columns']
+    return {
+        'X_train_selected': pd.DataFrame(arrays['X_train_selected'], columns=selected, copy=False),
+        'X_test_selected': pd.DataFrame(arrays['X_test_selected'], columns=selected, copy=False),
+        'y_train': pd.Series(arrays['y_train'], name='SalePrice', copy=False),
+        'y_test': pd.Series(arrays['y_test'], name='SalePrice', copy=False),
+        'y_train_log': pd.Series(arrays['y_train_log'], name='SalePrice', copy=False),
+        'y_test_log': pd.Series(arrays['y_test_log'], name='SalePrice', copy=False),
+        'correlation_matrix': pd.DataFrame(arrays['correlation_matrix'], index=meta['column_names'],
+                                           columns=meta['column_names'], copy=False),
+        'column_names': meta['column_names'],
+        'to_drop': meta['to_drop'],
+        'preprocessor': joblib.load(os.path.join(path, 'preprocessor.pkl'))
+    }
+
+
+if __name__ == "__main__":
+    # Warm the cache:
+    features = load_features()
+    print(f"Feature cache {cache_key()} ready in {CACHE_DIR}/")
+    print(f"Features to be dropped: {features['to_drop']}")
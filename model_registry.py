@@ -0,0 +1,219 @@
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import random
+import threading
+import time
+
+import joblib
+
+from compiled_trees import BACKEND, compile_pipeline, load_compiled
+from daegu_data import atomic_write, model_input
+
+REGISTRY_PATH = 'model_registry.json'
+
+# How often running apps check the manifest for changes (seconds):
+RELOAD_INTERVAL = 5
+
+default_manifest = {
+    'models': {
+        'xgb-pipeline-v1': {'kind': 'pipeline', 'paths': ['xgb_daegu_apartments_pipeline.sav']},
+        'xgb-split-v1': {'kind': 'split',
+                         'paths': ['preprocessor_daegu_apartments.pkl', 'model_daegu_apartments.pkl']},
+        'xgb-compressed-v1': {'kind': 'pipeline', 'paths': ['xgb_daegu_apartments_pipeline_compressed.sav']},
+        'xgb-compiled-v1': {'kind': 'compiled', 'paths': ['xgb_daegu_apartments_pipeline_compiled.pkl']},
+        'xgb-compressed-compiled-v1': {'kind': 'compiled',
+                                       'paths': ['xgb_daegu_apartments_pipeline_compressed_compiled.pkl']}
+    },
+    'active': 'xgb-pipeline-v1',
+    'challenger': None,
+    'challenger_share': 0.0
+}
+
+
+def read_manifest(path=REGISTRY_PATH):
+    if not os.path.exists(path):
+        return default_manifest
+    with open(path) as f:
+        return json.load(f)
+
+
+def write_manifest(manifest, path=REGISTRY_PATH):
+    with atomic_write(path) as tmp, open(tmp, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+
+def fingerprint(entry, backend=BACKEND):
+    # Artifact bytes + backend, used as the model version for stored predictions:
+    digest = hashlib.sha256()
+    for path in entry['paths']:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    digest.update(backend.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def load_entry(entry, backend=BACKEND):
+    if entry['kind'] == 'compiled':
+        return load_compiled(entry['paths'][0])
+    if entry['kind'] == 'pipeline':
+        pipeline = pickle.load(open(entry['paths'][0], 'rb'))
+    elif entry['kind'] == 'split':
+        from sklearn.pipeline import Pipeline  # only the sklearn kinds need sklearn
+        preprocessor, model = (joblib.load(path) for path in entry['paths'])
+        pipeline = Pipeline([('preprocess', preprocessor), ('model', model)])
+    else:
+        raise ValueError(f"Unknown model kind: {entry['kind']}")
+    return compile_pipeline(pipeline) if backend == 'compiled' else pipeline
+
+
+class TrackedModel:
+    # Wraps a loaded model and records per-model latency and errors:
+    def __init__(self, name, version, model, metrics):
+        self.name = name
+        self.version = version
+        self.model = model
+        self.metrics = metrics
+
+    def predict(self, X):
+        started = time.perf_counter()
+        try:
+            predictions = self.model.predict(model_input(X))
+        except Exception:
+            self.metrics.record(self.name, self.version, len(X), time.perf_counter() - started, error=True)
+            raise
+        self.metrics.record(self.name, self.version, len(X), time.perf_counter() - started)
+        return predictions
+
+
+class ModelMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def record(self, name, version, n_rows, seconds, error=False):
+        # Per artifact version, so a re-registered name does not merge with its predecessor:
+        with self._lock:
+            stats = self._stats.setdefault((name, version), {'requests': 0, 'rows': 0, 'errors': 0, 'seconds': 0.0, 'max': 0.0})
+            stats['requests'] += 1
+            stats['rows'] += n_rows
+            stats['errors'] += int(error)
+            stats['seconds'] += seconds
+            stats['max'] = max(stats['max'], seconds)
+
+    def summary(self):
+        with self._lock:
+            return [
+                {
+                    'Model': name,
+                    'Version': version,
+                    'Requests': s['requests'],
+                    'Rows': s['rows'],
+                    'Errors': s['errors'],
+                    'Error Rate (%)': 100 * s['errors'] / s['requests'],
+                    'Mean Latency (ms)': 1000 * s['seconds'] / s['requests'],
+                    'Max Latency (ms)': 1000 * s['max']
+                }
+                for (name, version), s in self._stats.items()
+            ]
+
+
+class ModelRegistry:
+    def __init__(self, path=REGISTRY_PATH, on_load=None):
+        self.path = path
+        self.on_load = on_load
+        self.metrics = ModelMetrics()
+        self._models = {}
+        self._mtime = None
+        self._lock = threading.Lock()
+        # (active, challenger, challenger share), replaced in one assignment:
+        self._routing = None
+        self.reload()
+
+    def _get(self, name, manifest):
+        # Loaded models are reused across swaps while their artifacts are unchanged
+        # (re-registering a name with new paths gives a new fingerprint, so it reloads):
+        entry = manifest['models'][name]
+        key = (name, fingerprint(entry))
+        if key not in self._models:
+            model = load_entry(entry)
+            if self.on_load is not None:
+                # e.g. warm the new model up before it takes traffic:
+                self.on_load(model)
+            self._models[key] = TrackedModel(name, key[1], model, self.metrics)
+        return self._models[key]
+
+    def reload(self):
+        # Load everything first, then swap the routing in one step:
+        with self._lock:
+            self._mtime = os.path.getmtime(self.path) if os.path.exists(self.path) else None
+            manifest = read_manifest(self.path)
+            active = self._get(manifest['active'], manifest)
+            challenger = self._get(manifest['challenger'], manifest) if manifest.get('challenger') else None
+            share = float(manifest.get('challenger_share', 0.0)) if challenger else 0.0
+            self._routing = (active, challenger, share)
+            # Drop models that are no longer routed:
+            routed = {(m.name, m.version) for m in (active, challenger) if m is not None}
+            self._models = {key: m for key, m in self._models.items() if key in routed}
+
+    def watch(self, interval=RELOAD_INTERVAL):
+        # Poll the manifest in the background so requests never pay for it:
+        def poll():
+            while True:
+                time.sleep(interval)
+                mtime = os.path.getmtime(self.path) if os.path.exists(self.path) else None
+                if mtime != self._mtime:
+                    try:
+                        self.reload()
+                    except Exception as e:
+                        print(f"Model registry reload failed, keeping current models: {e}")
+        threading.Thread(target=poll, daemon=True).start()
+        return self
+
+    def route(self):
+        active, challenger, share = self._routing
+        if challenger is not None and random.random() < share:
+            return challenger
+        return active
+
+    def predict(self, X):
+        return self.route().predict(X)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Manage the local Daegu model registry.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    subparsers.add_parser('list', help="Show registered models and routing")
+    activate = subparsers.add_parser('activate', help="Make a model the active model")
+    activate.add_argument('name')
+    challenger = subparsers.add_parser('challenger', help="Route a share of traffic to a challenger")
+    challenger.add_argument('name', nargs='?', help="Leave out to stop the A/B test")
+    challenger.add_argument('--share', type=float, default=0.1)
+    register = subparsers.add_parser('register', help="Register a new model artifact")
+    register.add_argument('name')
+    register.add_argument('kind', choices=['pipeline', 'split', 'compiled'])
+    register.add_argument('paths', nargs='+')
+    args = parser.parse_args()
+
+    manifest = read_manifest()
+    if args.command == 'activate':
+        load_entry(manifest['models'][args.name])
+        manifest['active'] = args.name
+    elif args.command == 'challenger':
+        if args.name:
+            load_entry(manifest['models'][args.name])
+        manifest['challenger'] = args.name
+        manifest['challenger_share'] = args.share if args.name else 0.0
+    elif args.command == 'register':
+        manifest['models'][args.name] = {'kind': args.kind, 'paths': args.paths}
+        load_entry(manifest['models'][args.name])
+    if args.command != 'list':
+        write_manifest(manifest)
+
+    for name, entry in manifest['models'].items():
+        role = 'active' if name == manifest['active'] else 'challenger' if name == manifest.get('challenger') else ''
+        print(f"{name:28} {entry['kind']:9} {role:10} {', '.join(entry['paths'])}")
+    if manifest.get('challenger'):
+        print(f"\nChallenger share: {manifest['challenger_share']:.0%}")
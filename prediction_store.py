@@ -0,0 +1,85 @@
+import sqlite3
+from contextlib import closing
+
+import numpy as np
+import pandas as pd
+
+from daegu_data import feature_columns, numeric_columns
+
+STORE_PATH = 'prediction_store.sqlite'
+
+# SQLite's limit on bound parameters per query:
+LOOKUP_BATCH_SIZE = 500
+
+
+def hash_rows(data):
+    # Normalise types so 3 and 3.0 (or '3') hash the same, then hash each row:
+    normalised = pd.DataFrame(index=data.index)
+    for col in feature_columns:
+        values = data[col] if col in data.columns else pd.Series(np.nan, index=data.index)
+        if col in numeric_columns:
+            normalised[col] = pd.to_numeric(values, errors='coerce').astype(float)
+        else:
+            normalised[col] = values.astype(str)
+    return pd.util.hash_pandas_object(normalised, index=False).to_numpy().view(np.int64)
+
+
+class PredictionStore:
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        with closing(self.connect()) as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS predictions (
+                    model_version TEXT NOT NULL,
+                    row_hash INTEGER NOT NULL,
+                    prediction REAL NOT NULL,
+                    PRIMARY KEY (model_version, row_hash)
+                )
+            """)
+
+    def connect(self):
+        return sqlite3.connect(self.path, timeout=30)
+
+    def lookup(self, version, hashes):
+        found = {}
+        with closing(self.connect()) as conn, conn:
+            for start in range(0, len(hashes), LOOKUP_BATCH_SIZE):
+                batch = [int(h) for h in hashes[start:start + LOOKUP_BATCH_SIZE]]
+                placeholders = ','.join('?' * len(batch))
+                rows = conn.execute(
+                    f"SELECT row_hash, prediction FROM predictions "
+                    f"WHERE model_version = ? AND row_hash IN ({placeholders})",
+                    [version] + batch
+                )
+                found.update(rows)
+        return found
+
+    def save(self, version, hashes, predictions):
+        # closing() closes the connection; the inner block commits the transaction:
+        with closing(self.connect()) as conn, conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO predictions (model_version, row_hash, prediction) VALUES (?, ?, ?)",
+                [(version, int(h), float(p)) for h, p in zip(hashes, predictions)]
+            )
+
+    def predict(self, model, data, version):
+        # Collapse duplicate rows, reuse stored predictions for this model version, score only the rest:
+        hashes = hash_rows(data)
+        unique_hashes, first_rows, inverse = np.unique(hashes, return_index=True, return_inverse=True)
+        found = self.lookup(version, unique_hashes)
+
+        unique_predictions = np.array([found.get(int(h), np.nan) for h in unique_hashes])
+        missing = np.isnan(unique_predictions)
+        if missing.any():
+            new_rows = data.iloc[first_rows[missing]]
+            unique_predictions[missing] = model.predict(new_rows)
+            self.save(version, unique_hashes[missing], unique_predictions[missing])
+
+        stats = {
+            'rows': len(data),
+            'duplicates': len(data) - len(unique_hashes),
+            'cached': int((~missing).sum()),
+            'scored': int(missing.sum())
+        }
+        return unique_predictions[inverse], stats
+
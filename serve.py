@@ -0,0 +1,35 @@
+import threading
+import time
+import urllib.request
+
+from streamlit import config
+from streamlit.web import bootstrap
+
+from warmup import READINESS_PORT, mark_ready, start_readiness_server, warm_up
+
+APP_PATH = 'Capstone 03.py'
+
+
+def wait_for_streamlit(port):
+    # Streamlit's own health check passes once it accepts connections:
+    url = f'http://localhost:{port}/_stcore/health'
+    while True:
+        try:
+            with urllib.request.urlopen(url, timeout=1) as response:
+                if response.status == 200:
+                    return
+        except OSError:
+            pass
+        time.sleep(0.2)
+
+
+if __name__ == "__main__":
+    # Report "warming up" until the model, figures and server are all ready:
+    start_readiness_server()
+    elapsed = warm_up()
+    print(f"Warmup finished in {elapsed:.1f}s, readiness probe on :{READINESS_PORT}/ready")
+
+    bootstrap.load_config_options(flag_options={})
+    port = config.get_option('server.port')
+    threading.Thread(target=lambda: (wait_for_streamlit(port), mark_ready()), daemon=True).start()
+    bootstrap.run(APP_PATH, False, [], flag_options={})
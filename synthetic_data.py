@@ -0,0 +1,119 @@
+import argparse
+import os
+import time
+from multiprocessing import Pool
+
+import numpy as np
+import pandas as pd
+
+from daegu_data import DATA_PATH, atomic_write, target_column
+
+OUTPUT_DIR = 'synthetic_data'
+
+# Rows per part file (each worker holds one chunk at a time):
+CHUNK_ROWS = 100_000
+
+# Columns sampled together, the rest come from their own marginals:
+station_time_columns = ['SubwayStation', 'TimeToSubway']
+size_year_columns = ['Size(sqf)', 'YearBuilt']
+
+_spec = None
+
+
+def joint_table(data, columns):
+    # Observed combinations of the columns and how often each occurs:
+    counts = data.groupby(columns, sort=True).size()
+    values = {col: counts.index.get_level_values(col).to_numpy() for col in columns}
+    return values, (counts / counts.sum()).to_numpy()
+
+
+def fit_generator(data):
+    # Learn from the raw CSV (original spellings), so generated files look like uploads:
+    joint_columns = station_time_columns + size_year_columns + [target_column]
+    spec = {
+        'columns': list(data.columns),
+        'marginals': {col: joint_table(data, [col]) for col in data.columns if col not in joint_columns},
+        'station_time': joint_table(data, station_time_columns),
+        'size_year': joint_table(data, size_year_columns)
+    }
+
+    # Prices observed for each size x year pair, stored back to back in the same order:
+    prices = data.sort_values(size_year_columns, kind='stable')[target_column].to_numpy()
+    counts = data.groupby(size_year_columns, sort=True).size().to_numpy()
+    spec['prices'] = prices
+    spec['price_starts'] = np.cumsum(counts) - counts
+    spec['price_counts'] = counts
+    return spec
+
+
+def sample(rng, table, n_rows):
+    values, probs = table
+    picked = rng.choice(len(probs), size=n_rows, p=probs)
+    return {col: col_values[picked] for col, col_values in values.items()}, picked
+
+
+def generate_chunk(spec, n_rows, seed, chunk_index):
+    # Seeded per chunk, so the output does not depend on the number of workers:
+    rng = np.random.default_rng([seed, chunk_index])
+    columns = {}
+    for table in spec['marginals'].values():
+        columns.update(sample(rng, table, n_rows)[0])
+    station_time, _ = sample(rng, spec['station_time'], n_rows)
+    size_year, pair = sample(rng, spec['size_year'], n_rows)
+    columns.update(station_time)
+    columns.update(size_year)
+
+    # A price seen for the sampled size x year pair:
+    offset = (rng.random(n_rows) * spec['price_counts'][pair]).astype(np.int64)
+    columns[target_column] = spec['prices'][spec['price_starts'][pair] + offset]
+    return pd.DataFrame(columns)[spec['columns']]
+
+
+def init_worker(spec):
+    global _spec
+    _spec = spec
+
+
+def write_chunk(task):
+    output, file_format, seed, chunk_index, n_rows = task
+    data = generate_chunk(_spec, n_rows, seed, chunk_index)
+    path = os.path.join(output, f'part-{chunk_index:05d}.{file_format}')
+    with atomic_write(path) as tmp:
+        if file_format == 'parquet':
+            data.to_parquet(tmp, index=False)
+        else:
+            data.to_csv(tmp, index=False)
+    return n_rows
+
+
+def generate(n_rows, output=OUTPUT_DIR, file_format='csv', seed=42, workers=None, chunk_rows=CHUNK_ROWS,
+             path=DATA_PATH):
+    # Stream n_rows to part files in output/, one chunk per task across a process pool:
+    spec = fit_generator(pd.read_csv(path))
+    os.makedirs(output, exist_ok=True)
+    tasks = (
+        (output, file_format, seed, i, min(chunk_rows, n_rows - start))
+        for i, start in enumerate(range(0, n_rows, chunk_rows))
+    )
+
+    started = time.perf_counter()
+    written = 0
+    with Pool(workers, initializer=init_worker, initargs=(spec,)) as pool:
+        for rows in pool.imap_unordered(write_chunk, tasks):
+            written += rows
+            print(f"\r{written:,} / {n_rows:,} rows", end='', flush=True)
+    elapsed = time.perf_counter() - started
+    print(f"\nWrote {written:,} rows to {output}/ in {elapsed:.1f}s ({written / elapsed:,.0f} rows/s)")
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate synthetic Daegu apartment listings for scale testing.")
+    parser.add_argument('rows', type=int, help="Number of rows to generate")
+    parser.add_argument('--output', default=OUTPUT_DIR, help=f"Output folder for part files (default: {OUTPUT_DIR})")
+    parser.add_argument('--format', default='csv', choices=['csv', 'parquet'], help="Parquet needs pyarrow")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: all cores)")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help="Rows per part file")
+    args = parser.parse_args()
+    generate(args.rows, args.output, args.format, args.seed, args.workers, args.chunk_rows)
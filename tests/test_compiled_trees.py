@@ -0,0 +1,39 @@
+import pickle
+
+import numpy as np
+import pytest
+
+from compiled_trees import COMPILED_MODEL_PATH, MODEL_PATH, PARITY_TOLERANCE, compile_pipeline, load_compiled
+from compress_model import check_test_alignment
+from daegu_data import train_test_data
+
+
+@pytest.fixture(scope='module')
+def pipeline():
+    with open(MODEL_PATH, 'rb') as f:
+        return pickle.load(f)
+
+
+@pytest.fixture(scope='module')
+def X_test():
+    # The rows behind X_test_selected.csv:
+    _, X_test, _, _ = train_test_data()
+    return X_test
+
+
+def test_split_matches_selected_test_rows(pipeline, X_test):
+    # The preprocessed rows equal X_test_selected.csv value for value:
+    assert check_test_alignment(pipeline.named_steps['preprocess'], X_test)
+
+
+def test_committed_compiled_pipeline_matches_model(pipeline, X_test):
+    # Fails when the pickle is stale against the .sav it was compiled from:
+    compiled = load_compiled(COMPILED_MODEL_PATH)
+    gap = np.abs(pipeline.predict(X_test) - compiled.predict(X_test)).max()
+    assert gap <= PARITY_TOLERANCE
+
+
+def test_fresh_compiled_pipeline_matches_model(pipeline, X_test):
+    compiled = compile_pipeline(pipeline)
+    gap = np.abs(pipeline.predict(X_test) - compiled.predict(X_test)).max()
+    assert gap <= PARITY_TOLERANCE
@@ -0,0 +1,174 @@
+import time
+
+import numpy as np
+import pandas as pd
+from catboost import CatBoostRegressor
+from sklearn.base import clone
+from sklearn.ensemble import GradientBoostingRegressor
+from sklearn.metrics import mean_absolute_error, mean_absolute_percentage_error, mean_squared_error, r2_score
+from sklearn.model_selection import KFold, ParameterSampler, train_test_split
+from xgboost import XGBRegressor
+
+# Boosted models from the notebook (CatBoost kept from writing the tracked catboost_info/ logs):
+models = {
+    "Gradient Boosting": GradientBoostingRegressor(random_state=42),
+    "XGBoost": XGBRegressor(random_state=42, verbosity=0),
+    "CatBoost": CatBoostRegressor(verbose=0, random_state=42, allow_writing_files=False),
+}
+
+# Hyperparameter grids (tree counts are read off a single fit instead of sampled):
+param_distributions = {
+    "Gradient Boosting": {
+        'n_estimators': [100, 200],
+        'learning_rate': [0.05, 0.1, 0.2],
+        'max_depth': [3, 5, 7],
+        'min_samples_split': [2, 5],
+        'min_samples_leaf': [1, 2]
+    },
+    "XGBoost": {
+        'n_estimators': [100, 200],
+        'learning_rate': [0.05, 0.1, 0.2],
+        'max_depth': [3, 5, 7],
+        'subsample': [0.7, 1.0],
+        'colsample_bytree': [0.7, 1.0]
+    },
+    "CatBoost": {
+        'depth': [4, 6, 8],
+        'learning_rate': [0.03, 0.1, 0.2],
+        'iterations': [100, 200, 300],
+        'l2_leaf_reg': [1, 3, 5]
+    }
+}
+
+# Tree-count parameter per model:
+tree_count_params = {
+    "Gradient Boosting": 'n_estimators',
+    "XGBoost": 'n_estimators',
+    "CatBoost": 'iterations'
+}
+
+# Rounds without improvement on the early-stopping holdout before a fit stops:
+EARLY_STOPPING_ROUNDS = 20
+
+# Share of each training fold held out for early stopping (never the fold being scored):
+EARLY_STOPPING_FRACTION = 0.1
+
+
+def fit_once(name, model, X_train, y_train, X_stop, y_stop):
+    # Fit the largest tree count once, stopping early on the inner holdout;
+    # returns the model and the tree count the fit settled on:
+    if name == "XGBoost":
+        model.set_params(early_stopping_rounds=EARLY_STOPPING_ROUNDS)
+        model.fit(X_train, y_train, eval_set=[(X_stop, y_stop)], verbose=False)
+        return model, model.best_iteration + 1
+    if name == "CatBoost":
+        model.fit(X_train, y_train, eval_set=(X_stop, y_stop), early_stopping_rounds=EARLY_STOPPING_ROUNDS,
+                  use_best_model=False)
+        return model, model.get_best_iteration() + 1
+    # GradientBoostingRegressor has no external eval set; staged_predict reads every prefix:
+    model.fit(X_train, y_train)
+    return model, model.n_estimators_
+
+
+def staged_predictions(name, model, X_val, tree_counts):
+    # Predictions of the first k trees, for each k (every k is within the fitted trees):
+    if name == "XGBoost":
+        return {k: model.predict(X_val, iteration_range=(0, k)) for k in tree_counts}
+    if name == "CatBoost":
+        return {k: model.predict(X_val, ntree_end=k) for k in tree_counts}
+    predictions = {}
+    for i, y_pred in enumerate(model.staged_predict(X_val), start=1):
+        if i in tree_counts:
+            predictions[i] = y_pred
+    return predictions
+
+
+def fold_metrics(y_true_log, y_pred_log):
+    # Inverse-transform scorers as in the notebook:
+    y_true = np.expm1(y_true_log)
+    y_pred = np.expm1(y_pred_log)
+    return {
+        'Mean MAE (₩)': mean_absolute_error(y_true, y_pred),
+        'Mean RMSE (₩)': np.sqrt(mean_squared_error(y_true, y_pred)),
+        'Mean R² (log)': r2_score(y_true_log, y_pred_log),
+        'Mean MAPE (%)': mean_absolute_percentage_error(y_true, y_pred) * 100
+    }
+
+
+def cross_validate(model, X, y, folds):
+    # Plain k-fold scores of a fixed model (no early stopping), like cross_val_score in the notebook:
+    return pd.DataFrame([
+        fold_metrics(y[val_idx], clone(model).fit(X[train_idx], y[train_idx]).predict(X[val_idx]))
+        for train_idx, val_idx in folds
+    ])
+
+
+def tune_boosted_models(X_train_selected, y_train_log, n_iter=20, cv=5, random_state=42, verbose=True):
+    X = np.asarray(X_train_selected)
+    y = np.asarray(y_train_log)
+    folds = list(KFold(n_splits=cv).split(X))
+
+    best_models = {}
+    best_params = {}
+    tuned_results = {}
+
+    for name, model in models.items():
+        if verbose:
+            print(f"Running tuning for {name}:")
+
+        # Sample configs without the tree count, then fit each config once per fold:
+        tree_param = tree_count_params[name]
+        tree_counts = sorted(param_distributions[name][tree_param])
+        grid = {k: v for k, v in param_distributions[name].items() if k != tree_param}
+        configs = list(ParameterSampler(grid, n_iter=n_iter, random_state=random_state))
+
+        started = time.perf_counter()
+        scores = {}
+        for params in configs:
+            fits = []
+            for train_idx, val_idx in folds:
+                fit_idx, stop_idx = train_test_split(train_idx, test_size=EARLY_STOPPING_FRACTION,
+                                                     random_state=random_state)
+                estimator = clone(model).set_params(**params, **{tree_param: tree_counts[-1]})
+                fits.append((fit_once(name, estimator, X[fit_idx], y[fit_idx], X[stop_idx], y[stop_idx]), val_idx))
+
+            # Only tree counts every fold reached, plus the count where the earliest fold stopped:
+            n_reached = min(n_trees for (_, n_trees), _ in fits)
+            counts = sorted({k for k in tree_counts if k <= n_reached} | {min(n_reached, tree_counts[-1])})
+            fold_scores = {k: [] for k in counts}
+            for (estimator, _), val_idx in fits:
+                for k, y_pred in staged_predictions(name, estimator, X[val_idx], counts).items():
+                    fold_scores[k].append(fold_metrics(y[val_idx], y_pred))
+            for k in counts:
+                candidate = tuple(sorted({**params, tree_param: k}.items()))
+                scores[candidate] = pd.DataFrame(fold_scores[k])
+
+        # Best candidate by cross-validated MAE, then scored as the exact model that is returned:
+        best = min(scores, key=lambda candidate: scores[candidate]['Mean MAE (₩)'].mean())
+        best_params[name] = dict(best)
+        best_model = clone(model).set_params(**best_params[name])
+        fold_df = cross_validate(best_model, X, y, folds)
+        if verbose:
+            print(f"Scored {len(scores)} candidates from {len(configs)} configs with {len(configs) * cv + cv} fits "
+                  f"in {time.perf_counter() - started:.1f}s")
+            print(f"Best MAE for {name}: {fold_df['Mean MAE (₩)'].mean():,.2f} (±{fold_df['Mean MAE (₩)'].std(ddof=0):.2f})")
+            print(f"Best MAPE for {name}: {fold_df['Mean MAPE (%)'].mean():.2f}% (±{fold_df['Mean MAPE (%)'].std(ddof=0):.2f}%)")
+            print(f"Best RMSE for {name}: {fold_df['Mean RMSE (₩)'].mean():,.2f} (±{fold_df['Mean RMSE (₩)'].std(ddof=0):.2f})")
+            print(f"Best R² (log scale) for {name}: {fold_df['Mean R² (log)'].mean():.4f} (±{fold_df['Mean R² (log)'].std(ddof=0):.4f})")
+            print(f"Best Params: {best_params[name]}\n")
+
+        # Refit the winner on the full training set with the tree count the table describes:
+        best_models[name] = best_model.fit(X_train_selected, y_train_log)
+        tuned_results[name] = fold_df.mean().to_dict()
+
+    tuned_cv_results_df = pd.DataFrame(tuned_results).T
+    return best_models, best_params, tuned_cv_results_df
+
+
+if __name__ == "__main__":
+    from feature_store import load_features
+
+    features = load_features()
+    _, _, tuned_cv_results_df = tune_boosted_models(features['X_train_selected'], features['y_train_log'])
+    print("\nTuned Model Cross-Validated Results:")
+    print(tuned_cv_results_df)
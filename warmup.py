@@ -0,0 +1,93 @@
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from daegu_data import feature_columns, load_dataset, load_listings
+from dashboard_figures import capstone_figures, portfolio_figures
+from model_registry import ModelRegistry
+
+# Ports for the load balancer's readiness probe, one per app so both can run on one host:
+READINESS_PORT = int(os.environ.get('DAEGU_READINESS_PORT', 8502))
+GRADIO_READINESS_PORT = int(os.environ.get('DAEGU_GRADIO_READINESS_PORT', 7861))
+
+# Rows scored in the warmup batch:
+WARMUP_BATCH_SIZE = 256
+
+_lock = threading.Lock()
+_ready = threading.Event()
+_server = None
+_model = None
+
+
+def get_model():
+    # One model registry per process, shared across app reruns and the warmup:
+    global _model
+    with _lock:
+        if _model is None:
+            _model = ModelRegistry(on_load=warm_model).watch()
+    return _model
+
+
+def warm_model(model, data=None):
+    # Representative single-row and batch predictions:
+    data = data if data is not None else load_dataset()
+    model.predict(data[feature_columns].head(1))
+    model.predict(data[feature_columns].head(WARMUP_BATCH_SIZE))
+
+
+def build_warmup_figures(data):
+    # The figures both apps draw, serialised so templates and trendline fits get loaded:
+    figures = list(capstone_figures(data).values()) + [fig for _, fig in portfolio_figures(data)]
+    for fig in figures:
+        fig.to_json()
+    return figures
+
+
+def warm_up():
+    # Routed models are warmed once, by the registry as it loads them; then the figures:
+    started = time.perf_counter()
+    get_model()
+    build_warmup_figures(load_listings())
+    return time.perf_counter() - started
+
+
+def mark_ready():
+    _ready.set()
+
+
+def is_ready():
+    return _ready.is_set()
+
+
+class ReadinessHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == '/ready':
+            status, body = (200, 'ready') if is_ready() else (503, 'warming up')
+        elif self.path == '/live':
+            status, body = 200, 'alive'
+        elif self.path == '/metrics' and _model is not None:
+            status, body = 200, {'models': _model.metrics.summary()}
+        else:
+            status, body = 404, 'not found'
+        payload = json.dumps(body if isinstance(body, dict) else {'status': body}).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        # Keep probe traffic out of the app logs:
+        pass
+
+
+def start_readiness_server(port=READINESS_PORT):
+    # Serve /ready and /live from a background thread (once per process):
+    global _server
+    with _lock:
+        if _server is None:
+            _server = ThreadingHTTPServer(('0.0.0.0', port), ReadinessHandler)
+            threading.Thread(target=_server.serve_forever, daemon=True).start()
+    return _server